@@ -0,0 +1,29 @@
+"""
+Gunicorn configuration for the application when deployed to render.com.
+Gunicorn loads this file automatically when started from the project root (gunicorn app:app).
+"""
+
+import gc
+import os
+
+# Number of worker processes (can be overridden with the WEB_CONCURRENCY environment variable).
+# The default is small and fixed rather than derived from the CPU count, which inside a container is the
+# host's: every worker holds the preloaded DataFrames, and the Render free instance only has 512 MB
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+
+# gevent workers yield during network I/O, so a slow client does not block other users
+worker_class = 'gevent'
+worker_connections = 1000
+
+# Load the application (data loading and initial aggregates) once in the master process,
+# so workers are forked with the data already in memory instead of reading it again
+preload_app = True
+
+
+def pre_fork(server, worker):
+    """
+    Freeze the objects created while preloading the application before forking each worker.
+    The garbage collector in the workers then skips them, so it does not write to their memory
+    pages and the preloaded data stays shared with the master (copy-on-write).
+    """
+    gc.freeze()
@@ -0,0 +1,23 @@
+"""
+Script para convertir los archivos CSV de datos a formato Parquet.
+La aplicación lee los archivos Parquet si existen, lo que reduce el tiempo de carga y el uso de memoria.
+Si no existen, la aplicación los genera en el primer arranque; este script permite generarlos durante el build.
+
+Uso (desde la raíz del proyecto):
+    python -m scripts.convert_to_parquet
+"""
+
+from src.data_processing.data_loader import DATASETS, read_csv_dataset, write_parquet_dataset
+
+
+def convert_to_parquet():
+    """
+    Convierte cada conjunto de datos definido en DATASETS de CSV a Parquet, conservando los tipos.
+    """
+    for name in DATASETS:
+        parquet_path = write_parquet_dataset(name, read_csv_dataset(name))
+        print(f"Archivo generado: {parquet_path}")
+
+
+if __name__ == '__main__':
+    convert_to_parquet()
@@ -0,0 +1,154 @@
+"""
+Script para generar la versión simplificada del GeoJSON de departamentos que usa el mapa.
+Reduce los vértices de cada polígono con el algoritmo de Douglas-Peucker y la precisión de las
+coordenadas, conserva solo las propiedades que usa el mapa y escribe el resultado sin sangrías, de modo que el archivo que el navegador descarga
+para el mapa es mucho más pequeño sin cambios visibles a la escala del mapa.
+
+Uso (desde la raíz del proyecto):
+    python -m scripts.simplify_geojson
+"""
+
+import json
+import math
+import os
+
+from src.visualizations.charts import GEOJSON_PATH
+
+# Constantes
+SOURCE_PATH = os.path.join(os.path.dirname(GEOJSON_PATH), 'departamentos.json')
+TOLERANCE = 0.005  # Grados (~500 m): menos de un píxel con la escala del mapa
+PRECISION = 4  # Decimales de las coordenadas (~11 m)
+PROPERTIES = ('NOMBRE_DPT',)  # Propiedades que usa el mapa (featureidkey de create_department_map)
+
+
+def perpendicular_distance(point, start, end):
+    """
+    Calcula la distancia de un punto al segmento entre dos puntos.
+
+    Args:
+        point (list): Coordenadas [x, y] del punto.
+        start (list): Coordenadas [x, y] del inicio del segmento.
+        end (list): Coordenadas [x, y] del final del segmento.
+
+    Returns:
+        float: Distancia del punto al segmento.
+    """
+    dx, dy = end[0] - start[0], end[1] - start[1]
+    length_squared = dx * dx + dy * dy
+    if length_squared == 0:
+        return math.hypot(point[0] - start[0], point[1] - start[1])
+
+    # Proyectar el punto sobre el segmento (limitado a sus extremos)
+    t = max(0.0, min(1.0, ((point[0] - start[0]) * dx + (point[1] - start[1]) * dy) / length_squared))
+    return math.hypot(point[0] - (start[0] + t * dx), point[1] - (start[1] + t * dy))
+
+
+def douglas_peucker(points, tolerance):
+    """
+    Simplifica una línea con el algoritmo de Douglas-Peucker, conservando sus extremos.
+    Se implementa con una pila en lugar de recursión para admitir líneas con muchos puntos.
+
+    Args:
+        points (list): Lista de coordenadas [x, y] de la línea.
+        tolerance (float): Distancia máxima entre la línea original y la simplificada.
+
+    Returns:
+        list: Lista de coordenadas de la línea simplificada.
+    """
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+
+    while stack:
+        first, last = stack.pop()
+        max_distance, max_index = 0.0, None
+        for index in range(first + 1, last):
+            distance = perpendicular_distance(points[index], points[first], points[last])
+            if distance > max_distance:
+                max_distance, max_index = distance, index
+
+        if max_index is not None and max_distance > tolerance:
+            keep[max_index] = True
+            stack.append((first, max_index))
+            stack.append((max_index, last))
+
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+def simplify_ring(ring, tolerance, precision):
+    """
+    Simplifica un anillo cerrado de un polígono y redondea sus coordenadas.
+
+    Args:
+        ring (list): Lista de coordenadas [x, y] del anillo (el primer y el último punto coinciden).
+        tolerance (float): Distancia máxima entre el anillo original y el simplificado.
+        precision (int): Número de decimales de las coordenadas.
+
+    Returns:
+        list: Anillo simplificado. Si quedan menos de 4 puntos, se conserva el anillo original redondeado.
+    """
+    # Dividir el anillo en dos líneas: del primer punto al más lejano y de vuelta
+    farthest = max(range(len(ring)), key=lambda index: math.hypot(ring[index][0] - ring[0][0],
+                                                                  ring[index][1] - ring[0][1]))
+    simplified = douglas_peucker(ring[:farthest + 1], tolerance)[:-1] + douglas_peucker(ring[farthest:], tolerance)
+
+    def round_points(points):
+        rounded = [[round(x, precision), round(y, precision)] for x, y in points]
+        # Eliminar puntos consecutivos repetidos tras el redondeo
+        return [point for index, point in enumerate(rounded) if index == 0 or point != rounded[index - 1]]
+
+    simplified = round_points(simplified)
+    if len(simplified) < 4:
+        return round_points(ring)
+    return simplified
+
+
+def simplify_geometry(geometry, tolerance, precision):
+    """
+    Simplifica una geometría de tipo Polygon o MultiPolygon.
+
+    Args:
+        geometry (dict): Geometría GeoJSON.
+        tolerance (float): Distancia máxima entre la geometría original y la simplificada.
+        precision (int): Número de decimales de las coordenadas.
+
+    Returns:
+        dict: Geometría GeoJSON simplificada.
+    """
+    def simplify_polygon(polygon):
+        return [simplify_ring(ring, tolerance, precision) for ring in polygon]
+
+    if geometry['type'] == 'Polygon':
+        coordinates = simplify_polygon(geometry['coordinates'])
+    else:
+        coordinates = [simplify_polygon(polygon) for polygon in geometry['coordinates']]
+
+    return {'type': geometry['type'], 'coordinates': coordinates}
+
+
+def simplify_geojson(source_path=SOURCE_PATH, target_path=GEOJSON_PATH, tolerance=TOLERANCE, precision=PRECISION):
+    """
+    Genera el GeoJSON simplificado de los departamentos a partir del archivo original.
+
+    Args:
+        source_path (str, optional): Ruta del GeoJSON original.
+        target_path (str, optional): Ruta del GeoJSON simplificado.
+        tolerance (float, optional): Distancia máxima (en grados) entre los polígonos originales y los simplificados.
+        precision (int, optional): Número de decimales de las coordenadas.
+    """
+    with open(source_path, 'r', encoding='utf-8') as f:
+        geojson_data = json.load(f)
+
+    for feature in geojson_data['features']:
+        feature['properties'] = {name: feature['properties'][name] for name in PROPERTIES}
+        feature['geometry'] = simplify_geometry(feature['geometry'], tolerance, precision)
+
+    with open(target_path, 'w', encoding='utf-8') as f:
+        json.dump(geojson_data, f, ensure_ascii=False, separators=(',', ':'))
+
+    print(f"Archivo generado: {target_path} "
+          f"({os.path.getsize(source_path) / 1e6:.2f} MB -> {os.path.getsize(target_path) / 1e6:.2f} MB)")
+
+
+if __name__ == '__main__':
+    simplify_geojson()
@@ -3,34 +3,117 @@ Aplicación principal para el análisis de mortalidad en Colombia.
 Este archivo integra todos los módulos y ejecuta la aplicación.
 """
 
+import glob
+import os
+import shutil
+import tempfile
+import time
+
 import dash
+import flask
 from dash.dash_table import DataTable
+from flask_caching import Cache
 
 from src.callbacks.callbacks import register_callbacks
+from src.data_processing.cache import disk_cached, source_key
 # Importar módulos de la aplicación
-from src.data_processing.data_loader import load_data, process_data_for_department_map, process_data_for_monthly_deaths, \
-    process_data_for_age_histogram, process_data_for_violent_cities, process_data_for_lowest_mortality_cities, \
-    process_data_for_top_causes, process_data_for_gender_department, get_homicide_codes_with_descriptions
+from src.data_processing.data_loader import load_data, precompute_all
 from src.layouts.layout import create_layout
-from src.utils.utils import MONTH_NAMES
+from src.utils.utils import MONTH_NAMES, GENDER_NAMES
 from src.visualizations.charts import create_department_map, create_monthly_deaths_chart, create_age_histogram, \
-    create_violent_cities_chart, create_lowest_mortality_chart, create_gender_department_chart
+    create_violent_cities_chart, create_lowest_mortality_chart, create_gender_department_chart, map_department_names, \
+    GEOJSON_PATH, GEOJSON_URL
+
+
+class CachedLayoutDash(dash.Dash):
+    """
+    Aplicación Dash que reutiliza el layout serializado a JSON mientras el layout asignado no cambie.
+    """
+
+    _layout_cache = None
+
+    def serve_layout(self):
+        """
+        Retorna el layout de la aplicación en JSON. Si el layout no es una función, la respuesta de Dash
+        (con los hooks de layout ya aplicados) se guarda y se reutiliza hasta que se asigne otro layout.
+
+        Returns:
+            flask.Response: Respuesta con el JSON del layout.
+        """
+        layout = self.layout
+        if callable(layout):
+            return super().serve_layout()
+
+        if self._layout_cache is None or self._layout_cache[0] is not layout:
+            self._layout_cache = (layout, super().serve_layout().get_data())
+
+        return flask.Response(self._layout_cache[1], mimetype='application/json')
+
 
 # Inicializar la aplicación Dash
-app = dash.Dash(__name__, suppress_callback_exceptions=True)
+app = CachedLayoutDash(__name__, suppress_callback_exceptions=True)
 server = app.server
 
+# Tiempo (en segundos) durante el que el navegador puede reutilizar el GeoJSON sin volver a pedirlo
+GEOJSON_MAX_AGE = 86400
+
+
+@server.route(GEOJSON_URL)
+def serve_departments_geojson():
+    """
+    Entrega el GeoJSON de los departamentos usado por el mapa, con cabeceras de caché para el navegador.
+
+    Returns:
+        flask.Response: Respuesta con el archivo GeoJSON.
+    """
+    return flask.send_file(GEOJSON_PATH, mimetype='application/json', max_age=GEOJSON_MAX_AGE)
+
+
+# Configurar la caché para memoizar las figuras de los callbacks por combinación de filtros.
+# El directorio depende de la versión de los datos y del código (la misma clave de la caché en disco
+# de los agregados iniciales), para que tras un cambio no se sirvan resultados calculados con la versión
+# anterior; FileSystemCache no usa CACHE_KEY_PREFIX, por lo que la versión va en la ruta
+CACHE_ROOT = os.path.join(tempfile.gettempdir(), 'dashcache')
+CACHE_DIR = os.path.join(CACHE_ROOT, source_key())
+
+# Tiempo (en segundos) sin escrituras tras el que se considera abandonada la caché de otra versión
+STALE_CACHE_AGE = 86400
+
+# Eliminar las cachés de versiones anteriores (incluidos los archivos de la caché sin versión). Solo se
+# eliminan las que no se han modificado en STALE_CACHE_AGE, para no borrar el directorio que otro proceso
+# (otro worker u otro despliegue en el mismo equipo) está usando en ese momento
+for old_cache_path in glob.glob(os.path.join(CACHE_ROOT, '*')):
+    try:
+        if old_cache_path == CACHE_DIR or time.time() - os.path.getmtime(old_cache_path) < STALE_CACHE_AGE:
+            continue
+    except OSError:
+        continue
+    if os.path.isdir(old_cache_path):
+        shutil.rmtree(old_cache_path, ignore_errors=True)
+    else:
+        try:
+            os.remove(old_cache_path)
+        except OSError:
+            pass
+
+cache = Cache(server, config={
+    'CACHE_TYPE': 'FileSystemCache',
+    'CACHE_DIR': CACHE_DIR
+})
+
 # Cargar datos
 df_mortality, df_codes, df_divipola = load_data()
 
-# Procesar datos para visualizaciones iniciales
-deaths_by_dept = process_data_for_department_map(df_mortality, df_divipola)
-deaths_by_month = process_data_for_monthly_deaths(df_mortality)
-deaths_by_age = process_data_for_age_histogram(df_mortality)
-top_violent_cities = process_data_for_violent_cities(df_mortality, df_divipola, df_codes)
-lowest_mortality_cities = process_data_for_lowest_mortality_cities(df_mortality, df_divipola)
-top_causes = process_data_for_top_causes(df_mortality, df_codes)
-deaths_by_dept_gender = process_data_for_gender_department(df_mortality, df_divipola)
+# Precalcular una sola vez todos los datos que no dependen de los filtros (reutilizando la caché
+# en disco de arranques anteriores); los callbacks solo calculan las variantes filtradas
+precomputed = disk_cached(precompute_all)(df_mortality, df_codes)
+deaths_by_dept = precomputed['deaths_by_dept']
+deaths_by_month = precomputed['deaths_by_month']
+deaths_by_age = precomputed['deaths_by_age']
+top_violent_cities = precomputed['top_violent_cities']
+lowest_mortality_cities = precomputed['lowest_mortality_cities']
+top_causes = precomputed['top_causes']
+deaths_by_dept_gender = precomputed['deaths_by_dept_gender']
 
 # Crear visualizaciones iniciales
 map_fig = create_department_map(deaths_by_dept)
@@ -82,12 +165,15 @@ top_causes_table = DataTable(
 # Obtener listas para filtros
 departments = sorted(deaths_by_dept['DEPARTAMENTO'].dropna().unique())
 manners_of_death = sorted(df_mortality['MANERA_MUERTE'].dropna().unique())
-months = [month for _, month in sorted([(k, v) for k, v in MONTH_NAMES.items()], key=lambda x: x[0])]
-gender_mapping = {1: 'Masculino', 2: 'Femenino', 3: 'Indeterminado'}
-genders = list(gender_mapping.values())
+months = [MONTH_NAMES[month] for month in sorted(MONTH_NAMES)]
+genders = list(GENDER_NAMES.values())
 
 # Obtener códigos de homicidio con sus descripciones
-homicide_code_desc_list = get_homicide_codes_with_descriptions(df_mortality, df_codes)
+homicide_code_desc_list = precomputed['homicide_code_desc_list']
+
+# Cubo de conteos para los callbacks del lado del cliente
+mortality_cube = precomputed['mortality_cube']
+mortality_cube['locations'] = map_department_names(df_mortality['DEPARTAMENTO'].cat.categories.to_series()).tolist()
 
 # Configurar el layout de la aplicación
 app.layout = create_layout(
@@ -102,11 +188,17 @@ app.layout = create_layout(
     manners_of_death, 
     months, 
     genders,
-    homicide_code_desc_list
+    homicide_code_desc_list,
+    mortality_cube
 )
 
+# Serializar el layout a JSON una sola vez: es estático (las figuras iniciales y el cubo de conteos ya
+# están precalculados), por lo que cada carga de la página retorna el mismo texto en lugar de recorrer y
+# serializar de nuevo las figuras y el cubo. Se hace al importar para que los workers lo hereden ya calculado
+app.serve_layout()
+
 # Registrar callbacks
-register_callbacks(app, df_mortality, df_divipola, gender_mapping, df_codes)
+register_callbacks(app, df_mortality, df_codes, cache, precomputed['count_cube'], precomputed['code_sizes'])
 
 # Ejecutar la aplicación
 if __name__ == '__main__':
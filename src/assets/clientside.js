@@ -0,0 +1,127 @@
+/*
+ * Callbacks del lado del cliente para la aplicación de análisis de mortalidad.
+ * Recalculan las figuras a partir del cubo de conteos precalculado en el servidor
+ * (dcc.Store 'mortality-cube'), sin hacer una petición al servidor cada vez que cambian los filtros.
+ */
+
+(function () {
+    /**
+     * Convierte los valores seleccionados en un filtro en un conjunto de códigos del cubo.
+     *
+     * @param {Array} selected - Valores seleccionados (puede ser null).
+     * @param {Array} names - Nombres de la dimensión, en el orden de sus códigos.
+     * @param {number} offset - Valor del código del primer nombre (0 para categorías, 1 para mes y sexo).
+     * @returns {Set|null} Conjunto de códigos seleccionados, o null si el filtro está vacío.
+     */
+    function toCodeSet(selected, names, offset) {
+        if (!selected || selected.length === 0) {
+            return null;
+        }
+        var codes = new Set();
+        selected.forEach(function (value) {
+            var index = names.indexOf(value);
+            if (index !== -1) {
+                codes.add(index + offset);
+            }
+        });
+        return codes;
+    }
+
+    /**
+     * Suma los conteos del cubo que cumplen los filtros, agrupados por una dimensión.
+     *
+     * @param {Object} cube - Cubo de conteos en formato columnar.
+     * @param {string} dimension - Dimensión por la que se agrupa ('dept', 'month', 'age', ...).
+     * @param {number} size - Número de códigos posibles de la dimensión.
+     * @param {Object} filters - Conjuntos de códigos por dimensión (null si no se filtra).
+     * @returns {Array} Conteo total por código de la dimensión.
+     */
+    function sumBy(cube, dimension, size, filters) {
+        var totals = new Array(size).fill(0);
+        var filterDimensions = Object.keys(filters).filter(function (name) {
+            return filters[name] !== null;
+        });
+
+        for (var i = 0; i < cube.count.length; i++) {
+            var selected = filterDimensions.every(function (name) {
+                return filters[name].has(cube[name][i]);
+            });
+            var key = cube[dimension][i];
+            if (selected && key >= 0) {
+                totals[key] += cube.count[i];
+            }
+        }
+        return totals;
+    }
+
+    /**
+     * Retorna una copia de la figura actualizando la primera traza y, opcionalmente, el layout.
+     *
+     * @param {Object} figure - Figura actual del gráfico.
+     * @param {Object} traceUpdate - Propiedades a reemplazar en la primera traza.
+     * @param {Object} layoutUpdate - Propiedades a reemplazar en el layout (opcional).
+     * @returns {Object} Nueva figura.
+     */
+    function withTrace(figure, traceUpdate, layoutUpdate) {
+        var trace = Object.assign({}, figure.data[0], traceUpdate);
+        var layout = Object.assign({}, figure.layout, layoutUpdate || {});
+        return Object.assign({}, figure, {data: [trace], layout: layout});
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        mortality: {
+            // Mapa de muertes por departamento
+            update_map: function (selectedManners, selectedMonths, selectedGenders, figure, cube) {
+                var totals = sumBy(cube, 'dept', cube.departments.length, {
+                    manner: toCodeSet(selectedManners, cube.manners, 0),
+                    month: toCodeSet(selectedMonths, cube.month_names, 1),
+                    sex: toCodeSet(selectedGenders, cube.gender_names, 1)
+                });
+
+                var locations = [];
+                var z = [];
+                totals.forEach(function (total, code) {
+                    if (total > 0) {
+                        locations.push(cube.locations[code]);
+                        z.push(total);
+                    }
+                });
+
+                var coloraxis = Object.assign({}, figure.layout.coloraxis, {
+                    cmin: 0,
+                    cmax: z.length > 0 ? Math.max.apply(null, z) : 0
+                });
+                return withTrace(figure, {locations: locations, z: z}, {coloraxis: coloraxis});
+            },
+
+            // Gráfico de línea de muertes por mes
+            update_monthly_chart: function (selectedDepts, selectedGenders, figure, cube) {
+                var totals = sumBy(cube, 'month', cube.month_names.length + 1, {
+                    dept: toCodeSet(selectedDepts, cube.departments, 0),
+                    sex: toCodeSet(selectedGenders, cube.gender_names, 1)
+                });
+
+                var x = [];
+                var y = [];
+                for (var month = 1; month < totals.length; month++) {
+                    if (totals[month] > 0) {
+                        x.push(cube.month_names[month - 1]);
+                        y.push(totals[month]);
+                    }
+                }
+                return withTrace(figure, {x: x, y: y});
+            },
+
+            // Histograma de muertes por grupo de edad
+            update_age_histogram: function (selectedDepts, selectedGenders, figure, cube) {
+                var totals = sumBy(cube, 'age', cube.age_groups.length, {
+                    dept: toCodeSet(selectedDepts, cube.departments, 0),
+                    sex: toCodeSet(selectedGenders, cube.gender_names, 1)
+                });
+
+                var marker = Object.assign({}, figure.data[0].marker, {color: totals});
+                return withTrace(figure, {x: cube.age_groups, y: totals, marker: marker});
+            }
+        }
+    });
+})();
@@ -3,162 +3,187 @@ Módulo para la definición de los callbacks de la aplicación.
 Contiene funciones para actualizar las visualizaciones en respuesta a las interacciones del usuario.
 """
 
-from dash import Input, Output
-from src.data_processing.data_loader import process_data_for_department_map, process_data_for_monthly_deaths, process_data_for_age_histogram, process_data_for_violent_cities, process_data_for_lowest_mortality_cities, process_data_for_gender_department
-from src.visualizations.charts import create_department_map, create_monthly_deaths_chart, create_age_histogram, create_violent_cities_chart, create_lowest_mortality_chart, create_gender_department_chart
-from src.utils.utils import MONTH_NAMES
+import functools
 
-def register_callbacks(app, df_mortality, df_divipola, gender_mapping, df_codes=None):
-    """
-    Registra todos los callbacks de la aplicación.
-
-    Args:
-        app (dash.Dash): Instancia de la aplicación Dash.
-        df_mortality (pandas.DataFrame): DataFrame con los datos de mortalidad.
-        df_divipola (pandas.DataFrame): DataFrame con los datos de división política de Colombia.
-        gender_mapping (dict): Diccionario que mapea códigos de género a nombres.
-    """
+from dash import ClientsideFunction, Input, Output, Patch, State
+from src.data_processing.data_loader import process_data_for_violent_cities, process_data_for_lowest_mortality_cities, build_count_cube, \
+    sum_count_cube, filter_mask, select_top_departments, integer_code_sizes
+from src.utils.utils import MONTH_NUMS, GENDER_NAMES, GENDER_CODES, extract_death_codes
 
-    # --- Callback para el Mapa ---
-    @app.callback(
-        Output('map-graph', 'figure'),
-        [Input('map-manner-filter', 'value'),
-         Input('map-month-filter', 'value'),
-         Input('map-gender-filter', 'value')]
-    )
-    def update_map(selected_manners, selected_months, selected_genders):
-        """
-        Actualiza el mapa de departamentos según los filtros seleccionados.
+# Constantes
+CACHE_TIMEOUT = 3600
+MEMORY_CACHE_SIZE = 256
 
-        Args:
-            selected_manners (list): Lista de maneras de muerte seleccionadas.
-            selected_months (list): Lista de meses seleccionados.
-            selected_genders (list): Lista de géneros seleccionados.
 
-        Returns:
-            plotly.graph_objects.Figure: Figura actualizada del mapa.
-        """
-        # Crear una copia del DataFrame original
-        filtered_df = df_mortality.copy()
+def _as_key(values):
+    """
+    Convierte la selección de un filtro en una tupla ordenada para usarla como clave de caché.
 
-        # Aplicar filtros si se han seleccionado
-        if selected_manners and len(selected_manners) > 0:
-            filtered_df = filtered_df[filtered_df['MANERA_MUERTE'].isin(selected_manners)]
+    Args:
+        values (list): Lista de valores seleccionados en el filtro (puede ser None).
 
-        if selected_months and len(selected_months) > 0:
-            month_to_num = {v: k for k, v in MONTH_NAMES.items()}
-            selected_month_nums = [month_to_num[month] for month in selected_months]
-            filtered_df = filtered_df[filtered_df['MES'].isin(selected_month_nums)]
+    Returns:
+        tuple: Tupla ordenada con los valores seleccionados.
+    """
+    return tuple(sorted(values or ()))
 
-        if selected_genders and len(selected_genders) > 0:
-            gender_to_code = {v: k for k, v in gender_mapping.items()}
-            selected_gender_codes = [gender_to_code[gender] for gender in selected_genders]
-            filtered_df = filtered_df[filtered_df['SEXO'].isin(selected_gender_codes)]
 
-        # Procesar datos filtrados
-        filtered_deaths_by_dept = process_data_for_department_map(filtered_df, df_divipola)
+def _selection_filters(genders=(), manners=(), months=(), departments=()):
+    """
+    Convierte las selecciones de los filtros (valores mostrados en los dropdowns) en los valores de
+    cada columna de los datos, en el formato usado por filter_mask y sum_count_cube.
 
-        # Crear visualización actualizada
-        updated_map_fig = create_department_map(filtered_deaths_by_dept)
+    Args:
+        genders (tuple, optional): Nombres de géneros seleccionados.
+        manners (tuple, optional): Maneras de muerte seleccionadas.
+        months (tuple, optional): Nombres de meses seleccionados.
+        departments (tuple, optional): Departamentos seleccionados.
 
-        return updated_map_fig
+    Returns:
+        dict: Valores seleccionados por columna (las listas vacías indican que no se filtra).
+    """
+    return {
+        'SEXO': [GENDER_CODES[gender] for gender in genders],
+        'MANERA_MUERTE': list(manners),
+        'MES': [MONTH_NUMS[month] for month in months],
+        'DEPARTAMENTO': list(departments)
+    }
 
 
-    # --- Callback para Muertes por Mes ---
-    @app.callback(
-        Output('monthly-deaths-graph', 'figure'),
-        [Input('monthly-dept-filter', 'value'),
-         Input('monthly-gender-filter', 'value')]
-    )
-    def update_monthly_chart(selected_depts, selected_genders):
-        """
-        Actualiza el gráfico de muertes mensuales según los filtros seleccionados.
+def _selection_mask(df_mortality, code_sizes, **selection):
+    """
+    Construye la máscara booleana de las filas que cumplen las selecciones de los filtros, sin copiar
+    ni filtrar el DataFrame.
 
-        Args:
-            selected_depts (list): Lista de departamentos seleccionados.
-            selected_genders (list): Lista de géneros seleccionados.
+    Args:
+        df_mortality (pandas.DataFrame): DataFrame con los datos de mortalidad.
+        code_sizes (dict): Número de códigos de cada columna de enteros (ver integer_code_sizes).
+        **selection: Selecciones de los filtros (argumentos de _selection_filters).
 
-        Returns:
-            plotly.graph_objects.Figure: Figura actualizada del gráfico de muertes mensuales.
-        """
-        # Crear una copia del DataFrame original
-        filtered_df = df_mortality.copy()
+    Returns:
+        numpy.ndarray: Máscara booleana con las filas seleccionadas, o None si no hay filtros.
+    """
+    return filter_mask(df_mortality, _selection_filters(**selection), code_sizes)
 
-        # Combinar con divipola para obtener nombres de departamentos
-        if selected_depts and len(selected_depts) > 0:
-            # Primero añadir la columna DEPARTAMENTO
-            filtered_df = filtered_df.merge(
-                df_divipola[['COD_DANE', 'COD_DEPARTAMENTO', 'DEPARTAMENTO']],
-                on='COD_DANE',
-                how='left'
-            )
-            # Luego filtrar por departamento
-            filtered_df = filtered_df[filtered_df['DEPARTAMENTO'].isin(selected_depts)]
 
-        if selected_genders and len(selected_genders) > 0:
-            gender_to_code = {v: k for k, v in gender_mapping.items()}
-            selected_gender_codes = [gender_to_code[gender] for gender in selected_genders]
-            filtered_df = filtered_df[filtered_df['SEXO'].isin(selected_gender_codes)]
+def _patch_traces(traces):
+    """
+    Construye una actualización parcial de una figura que reemplaza solo los datos de sus trazas,
+    conservando el layout de la figura en el navegador.
 
-        # Procesar datos filtrados
-        filtered_deaths_by_month = process_data_for_monthly_deaths(filtered_df)
+    Args:
+        traces (list): Un dict por traza (en el orden de la figura) con los valores de cada propiedad.
+                       Las propiedades anidadas se indican con puntos (por ejemplo, 'marker.color').
 
-        # Crear visualización actualizada
-        updated_monthly_deaths_fig = create_monthly_deaths_chart(filtered_deaths_by_month)
+    Returns:
+        dash.Patch: Actualización parcial de la figura.
+    """
+    patched_figure = Patch()
+    for index, trace in enumerate(traces):
+        for prop, values in trace.items():
+            *parents, name = prop.split('.')
+            target = patched_figure['data'][index]
+            for parent in parents:
+                target = target[parent]
+            target[name] = values
+    return patched_figure
+
+
+def register_callbacks(app, df_mortality, df_codes=None, cache=None, count_cube=None, code_sizes=None):
+    """
+    Registra todos los callbacks de la aplicación.
 
-        return updated_monthly_deaths_fig
+    Args:
+        app (dash.Dash): Instancia de la aplicación Dash.
+        df_mortality (pandas.DataFrame): DataFrame con los datos de mortalidad, con los nombres de divipola.
+        df_codes (pandas.DataFrame, optional): DataFrame con los códigos de causas de muerte.
+        cache (flask_caching.Cache, optional): Caché usada para memoizar los datos por combinación de filtros.
+        count_cube (pandas.Series, optional): Cubo de conteos precalculado con build_count_cube. Si es None, se construye.
+        code_sizes (dict, optional): Número de códigos de las columnas de enteros precalculado con integer_code_sizes.
+                                     Si es None, se calcula.
+    """
+    # Cubo de conteos por departamento, género, mes y manera de muerte para el gráfico de género y departamento
+    if count_cube is None:
+        count_cube = build_count_cube(df_mortality)
+
+    # Tamaño de las tablas de búsqueda de filter_mask para las columnas de enteros (como SEXO)
+    if code_sizes is None:
+        code_sizes = integer_code_sizes(df_mortality)
+
+    def memoize(func):
+        # Memoizar los datos de cada gráfico por combinación de filtros: primero en memoria del proceso
+        # (las claves son tuplas) y, si se proporcionó una caché, en la caché compartida entre procesos
+        if cache is not None:
+            func = cache.memoize(timeout=CACHE_TIMEOUT)(func)
+        return functools.lru_cache(maxsize=MEMORY_CACHE_SIZE)(func)
+
+    @memoize
+    def _violent_cities_data(selected_violent_types, selected_genders):
+        mask = _selection_mask(df_mortality, code_sizes, genders=selected_genders)
+        return process_data_for_violent_cities(df_mortality, df_codes, extract_death_codes(selected_violent_types), mask)
+
+    @memoize
+    def _lowest_mortality_data(selected_genders):
+        mask = _selection_mask(df_mortality, code_sizes, genders=selected_genders)
+        return process_data_for_lowest_mortality_cities(df_mortality, mask)
+
+    @memoize
+    def _gender_dept_data(selected_manners, selected_months):
+        # Sumar el cubo de conteos con los filtros seleccionados (sin recorrer todas las filas)
+        deaths_by_dept_gender = sum_count_cube(
+            count_cube,
+            by=['DEPARTAMENTO', 'GENDER'],
+            filters=_selection_filters(manners=selected_manners, months=selected_months)
+        ).reset_index(name='COUNT')
+
+        # Conservar los 10 departamentos con más muertes
+        return select_top_departments(deaths_by_dept_gender)
+
+
+    # Todos los callbacks usan prevent_initial_call: al cargar la página los filtros están vacíos y el
+    # layout ya contiene las figuras iniciales precalculadas, por lo que no se recalculan.
+
+    # --- Callbacks del lado del cliente (src/assets/clientside.js) ---
+    # El mapa, las muertes por mes y la distribución por edad se recalculan en el navegador
+    # a partir del cubo de conteos almacenado en 'mortality-cube', sin consultar al servidor.
+    app.clientside_callback(
+        ClientsideFunction(namespace='mortality', function_name='update_map'),
+        Output('map-graph', 'figure'),
+        [Input('map-manner-filter', 'value'),
+         Input('map-month-filter', 'value'),
+         Input('map-gender-filter', 'value')],
+        [State('map-graph', 'figure'),
+         State('mortality-cube', 'data')],
+        prevent_initial_call=True
+    )
 
+    app.clientside_callback(
+        ClientsideFunction(namespace='mortality', function_name='update_monthly_chart'),
+        Output('monthly-deaths-graph', 'figure'),
+        [Input('monthly-dept-filter', 'value'),
+         Input('monthly-gender-filter', 'value')],
+        [State('monthly-deaths-graph', 'figure'),
+         State('mortality-cube', 'data')],
+        prevent_initial_call=True
+    )
 
-    # --- Callback para Distribución por Edad ---
-    @app.callback(
+    app.clientside_callback(
+        ClientsideFunction(namespace='mortality', function_name='update_age_histogram'),
         Output('age-histogram', 'figure'),
         [Input('age-dept-filter', 'value'),
-         Input('age-gender-filter', 'value')]
+         Input('age-gender-filter', 'value')],
+        [State('age-histogram', 'figure'),
+         State('mortality-cube', 'data')],
+        prevent_initial_call=True
     )
-    def update_age_histogram(selected_depts, selected_genders):
-        """
-        Actualiza el histograma de edad según los filtros seleccionados.
-
-        Args:
-            selected_depts (list): Lista de departamentos seleccionados.
-            selected_genders (list): Lista de géneros seleccionados.
-
-        Returns:
-            plotly.graph_objects.Figure: Figura actualizada del histograma de edad.
-        """
-        # Crear una copia del DataFrame original
-        filtered_df = df_mortality.copy()
-
-        # Combinar con divipola para obtener nombres de departamentos
-        if selected_depts and len(selected_depts) > 0:
-            # Primero añadir la columna DEPARTAMENTO
-            filtered_df = filtered_df.merge(
-                df_divipola[['COD_DANE', 'COD_DEPARTAMENTO', 'DEPARTAMENTO']],
-                on='COD_DANE',
-                how='left'
-            )
-            # Luego filtrar por departamento
-            filtered_df = filtered_df[filtered_df['DEPARTAMENTO'].isin(selected_depts)]
-
-        if selected_genders and len(selected_genders) > 0:
-            gender_to_code = {v: k for k, v in gender_mapping.items()}
-            selected_gender_codes = [gender_to_code[gender] for gender in selected_genders]
-            filtered_df = filtered_df[filtered_df['SEXO'].isin(selected_gender_codes)]
-
-        # Procesar datos filtrados
-        filtered_deaths_by_age = process_data_for_age_histogram(filtered_df)
-
-        # Crear visualización actualizada
-        updated_age_histogram_fig = create_age_histogram(filtered_deaths_by_age)
-
-        return updated_age_histogram_fig
 
 
     # --- Callback para Ciudades más Violentas ---
     @app.callback(
         Output('violent-cities-graph', 'figure'),
         [Input('violent-manner-filter', 'value'),
-         Input('violent-gender-filter', 'value')]
+         Input('violent-gender-filter', 'value')],
+        prevent_initial_call=True
     )
     def update_violent_cities_chart(selected_violent_types, selected_genders):
         """
@@ -169,38 +194,21 @@ def register_callbacks(app, df_mortality, df_divipola, gender_mapping, df_codes=
             selected_genders (list): Lista de géneros seleccionados.
 
         Returns:
-            plotly.graph_objects.Figure: Figura actualizada del gráfico de ciudades más violentas.
+            dash.Patch: Actualización parcial de la figura con los datos del gráfico de ciudades más violentas.
         """
-        # Crear una copia del DataFrame original
-        filtered_df = df_mortality.copy()
-
-        # Aplicar filtro de género si se ha seleccionado
-        if selected_genders and len(selected_genders) > 0:
-            gender_to_code = {v: k for k, v in gender_mapping.items()}
-            selected_gender_codes = [gender_to_code[gender] for gender in selected_genders]
-            filtered_df = filtered_df[filtered_df['SEXO'].isin(selected_gender_codes)]
-
-        # Extraer los códigos de muerte de las descripciones seleccionadas
-        selected_codes = []
-        if selected_violent_types and len(selected_violent_types) > 0:
-            for desc in selected_violent_types:
-                # Extraer el código de la descripción (formato: "X994 - Descripción")
-                code = desc.split(' - ')[0]
-                selected_codes.append(code)
-
-        # Procesar datos filtrados, pasando los códigos de homicidios seleccionados
-        filtered_violent_cities = process_data_for_violent_cities(filtered_df, df_divipola, df_codes, selected_codes)
-
-        # Crear visualización actualizada
-        updated_violent_cities_fig = create_violent_cities_chart(filtered_violent_cities)
-
-        return updated_violent_cities_fig
+        top_violent_cities = _violent_cities_data(_as_key(selected_violent_types), _as_key(selected_genders))
+        return _patch_traces([{
+            'x': top_violent_cities['HOMICIDES'].tolist(),
+            'y': top_violent_cities['MUNICIPIO'].tolist(),
+            'marker.color': top_violent_cities['HOMICIDES'].tolist()
+        }])
 
 
     # --- Callback para Ciudades con Menor Mortalidad ---
     @app.callback(
         Output('lowest-mortality-graph', 'figure'),
-        [Input('lowest-gender-filter', 'value')]
+        [Input('lowest-gender-filter', 'value')],
+        prevent_initial_call=True
     )
     def update_lowest_mortality_chart(selected_genders):
         """
@@ -210,31 +218,21 @@ def register_callbacks(app, df_mortality, df_divipola, gender_mapping, df_codes=
             selected_genders (list): Lista de géneros seleccionados.
 
         Returns:
-            plotly.graph_objects.Figure: Figura actualizada del gráfico de ciudades con menor mortalidad.
+            dash.Patch: Actualización parcial de la figura con los datos del gráfico de ciudades con menor mortalidad.
         """
-        # Crear una copia del DataFrame original
-        filtered_df = df_mortality.copy()
-
-        # Aplicar filtros si se han seleccionado
-        if selected_genders and len(selected_genders) > 0:
-            gender_to_code = {v: k for k, v in gender_mapping.items()}
-            selected_gender_codes = [gender_to_code[gender] for gender in selected_genders]
-            filtered_df = filtered_df[filtered_df['SEXO'].isin(selected_gender_codes)]
-
-        # Procesar datos filtrados
-        filtered_lowest_mortality = process_data_for_lowest_mortality_cities(filtered_df, df_divipola)
-
-        # Crear visualización actualizada
-        updated_lowest_mortality_fig = create_lowest_mortality_chart(filtered_lowest_mortality)
-
-        return updated_lowest_mortality_fig
+        lowest_mortality_cities = _lowest_mortality_data(_as_key(selected_genders))
+        return _patch_traces([{
+            'labels': lowest_mortality_cities['MUNICIPIO'].tolist(),
+            'values': lowest_mortality_cities['DEATHS'].tolist()
+        }])
 
 
     # --- Callback para Muertes por Género y Departamento ---
     @app.callback(
         Output('gender-dept-graph', 'figure'),
         [Input('gender-dept-manner-filter', 'value'),
-         Input('gender-dept-month-filter', 'value')]
+         Input('gender-dept-month-filter', 'value')],
+        prevent_initial_call=True
     )
     def update_gender_dept_chart(selected_manners, selected_months):
         """
@@ -245,24 +243,16 @@ def register_callbacks(app, df_mortality, df_divipola, gender_mapping, df_codes=
             selected_months (list): Lista de meses seleccionados.
 
         Returns:
-            plotly.graph_objects.Figure: Figura actualizada del gráfico de muertes por género y departamento.
+            dash.Patch: Actualización parcial de la figura con los datos del gráfico de muertes por género y departamento.
         """
-        # Crear una copia del DataFrame original
-        filtered_df = df_mortality.copy()
-
-        # Aplicar filtros si se han seleccionado
-        if selected_manners and len(selected_manners) > 0:
-            filtered_df = filtered_df[filtered_df['MANERA_MUERTE'].isin(selected_manners)]
-
-        if selected_months and len(selected_months) > 0:
-            month_to_num = {v: k for k, v in MONTH_NAMES.items()}
-            selected_month_nums = [month_to_num[month] for month in selected_months]
-            filtered_df = filtered_df[filtered_df['MES'].isin(selected_month_nums)]
-
-        # Procesar datos filtrados
-        filtered_deaths_by_dept_gender = process_data_for_gender_department(filtered_df, df_divipola)
-
-        # Crear visualización actualizada
-        updated_gender_dept_fig = create_gender_department_chart(filtered_deaths_by_dept_gender)
-
-        return updated_gender_dept_fig
+        top_deaths_by_dept_gender = _gender_dept_data(_as_key(selected_manners), _as_key(selected_months))
+
+        # Una traza por género, en el orden de GENDER_NAMES
+        gender_traces = []
+        for gender in GENDER_NAMES.values():
+            gender_rows = top_deaths_by_dept_gender[top_deaths_by_dept_gender['GENDER'] == gender]
+            gender_traces.append({
+                'x': gender_rows['DEPARTAMENTO'].tolist(),
+                'y': gender_rows['COUNT'].tolist()
+            })
+        return _patch_traces(gender_traces)
@@ -0,0 +1,129 @@
+"""
+Módulo para la caché en disco de los datos agregados al iniciar la aplicación.
+Permite que los procesos de la aplicación reutilicen los agregados calculados en un arranque anterior.
+"""
+
+import functools
+import glob
+import hashlib
+import os
+import pickle
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from src.callbacks import callbacks
+from src.data_processing import data_loader
+from src.data_processing.data_loader import DATA_PATH, DATASETS
+from src.utils import utils
+from src.visualizations import charts
+
+# Constantes
+CACHE_DIR = os.path.join(DATA_PATH, '.cache')
+
+
+def source_key():
+    """
+    Calcula una clave a partir de la fecha de modificación de los archivos de datos, de los módulos de
+    procesamiento, de utilidades (nombres de meses y géneros), de callbacks y de gráficos, y de las
+    versiones de pandas y numpy, de modo que la caché se invalide si cambian los datos, el código que
+    calcula los resultados memoizados o las bibliotecas que los serializan.
+
+    Returns:
+        str: Clave hexadecimal corta que identifica la versión de los datos de origen.
+    """
+    paths = [f'{DATA_PATH}{name}.csv' for name in DATASETS] + [
+        module.__file__ for module in (data_loader, utils, callbacks, charts)
+    ]
+    mtimes = tuple(os.path.getmtime(path) if os.path.exists(path) else None for path in paths)
+    key = (mtimes, pd.__version__, np.__version__)
+    return hashlib.md5(repr(key).encode('utf-8')).hexdigest()[:12]
+
+
+def arguments_key(args, kwargs):
+    """
+    Calcula una clave a partir de los argumentos de una llamada. Los DataFrames y Series se identifican
+    por su contenido (valores, índice, columnas y tipos) y los demás valores por su representación.
+
+    Args:
+        args (tuple): Argumentos posicionales de la llamada.
+        kwargs (dict): Argumentos con nombre de la llamada.
+
+    Returns:
+        str: Clave hexadecimal que identifica los argumentos.
+    """
+    values = list(args)
+    for name in sorted(kwargs):
+        values += [name, kwargs[name]]
+
+    digest = hashlib.md5()
+    for value in values:
+        if isinstance(value, pd.DataFrame):
+            digest.update(repr((list(value.columns), [str(dtype) for dtype in value.dtypes])).encode('utf-8'))
+            digest.update(pd.util.hash_pandas_object(value).to_numpy().tobytes())
+        elif isinstance(value, pd.Series):
+            digest.update(repr((value.name, str(value.dtype))).encode('utf-8'))
+            digest.update(pd.util.hash_pandas_object(value).to_numpy().tobytes())
+        else:
+            digest.update(repr(value).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def disk_cached(func):
+    """
+    Decorador que guarda en disco el resultado de una función de procesamiento.
+
+    La clave de la caché depende del nombre de la función, de la versión de los datos de origen y del
+    contenido de los argumentos (ver arguments_key). Solo se conserva en disco el último resultado de
+    cada función.
+
+    Args:
+        func (callable): Función de procesamiento a memoizar.
+
+    Returns:
+        callable: Función que retorna el resultado almacenado en disco si existe.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = hashlib.md5(f'{source_key()}_{arguments_key(args, kwargs)}'.encode('utf-8')).hexdigest()[:12]
+        cache_path = os.path.join(CACHE_DIR, f'{func.__name__}_{key}.pkl')
+
+        try:
+            with open(cache_path, 'rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            # El archivo es regenerable: si no se puede leer (incompleto o incompatible), se recalcula
+            print(f"No fue posible leer la caché de '{func.__name__}', se recalculará: {e}")
+            try:
+                os.remove(cache_path)
+            except OSError:
+                pass
+
+        result = func(*args, **kwargs)
+
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+
+            # Eliminar versiones anteriores del mismo agregado
+            for old_path in glob.glob(os.path.join(CACHE_DIR, f'{func.__name__}_*.pkl')):
+                os.remove(old_path)
+
+            # Escribir en un archivo temporal y reemplazar, para que otros procesos no lean un archivo incompleto
+            fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump(result, f)
+                os.replace(tmp_path, cache_path)
+            finally:
+                # Si la escritura o el reemplazo fallan, no dejar el archivo temporal en CACHE_DIR
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        except OSError as e:
+            print(f"No fue posible guardar la caché de '{func.__name__}': {e}")
+
+        return result
+
+    return wrapper
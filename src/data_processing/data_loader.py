@@ -1,18 +1,298 @@
 """
 Módulo para la carga y procesamiento de datos de mortalidad.
-Contiene funciones para cargar los datos desde archivos CSV y procesarlos para su visualización.
+Contiene funciones para cargar los datos desde archivos CSV (o su versión Parquet) y procesarlos para su visualización.
 """
 
+import functools
+
+import numpy as np
 import pandas as pd
 import os
+import tempfile
 
 # Constantes
 DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data/')
-from src.utils.utils import MONTH_NAMES
+from src.utils.utils import MONTH_NAMES, GENDER_NAMES
+
+# Opciones de lectura de cada conjunto de datos: solo las columnas que usa la aplicación, con categorías
+# para las columnas de texto repetido (las columnas enteras se reducen al leer el CSV, ver read_csv_dataset)
+DATASETS = {
+    'NoFetal2019': {
+        'usecols': ['COD_DANE', 'MES', 'SEXO', 'GRUPO_EDAD1', 'MANERA_MUERTE', 'COD_MUERTE'],
+        'dtype': {'MANERA_MUERTE': 'category', 'COD_MUERTE': 'category'}
+    },
+    # Textos largos de la CIE-10: columnas respaldadas por Arrow en lugar de objetos de Python
+    'CodigosDeMuerte': {'delimiter': ';', 'dtype_backend': 'pyarrow'},
+    'Divipola': {'delimiter': ';', 'usecols': ['COD_DANE', 'DEPARTAMENTO', 'MUNICIPIO']}
+}
+
+# Grupos de edad para el histograma de distribución por edad
+AGE_BINS = [0, 5, 10, 15, 20, 25, 30, 35, 40, 45, 50, 55, 60, 65, 70, 75, 80, 85, 90, 95, 100, 150]
+AGE_LABELS = [
+    '0-4', '5-9', '10-14', '15-19', '20-24', '25-29', '30-34', '35-39', '40-44',
+    '45-49', '50-54', '55-59', '60-64', '65-69', '70-74', '75-79', '80-84',
+    '85-89', '90-94', '95-99', '100+'
+]
+AGE_GROUP_DTYPE = pd.CategoricalDtype(AGE_LABELS, ordered=True)
+
+# Nombres cortos para las columnas de código y descripción CIE-10 (cuatro caracteres) de CodigosDeMuerte
+CODES_COLUMNS = {
+    'Código de la CIE-10 cuatro caracteres': 'COD',
+    'Descripcion  de códigos mortalidad a cuatro caracteres': 'DESC'
+}
+
+
+def age_group_codes(ages):
+    """
+    Calcula el código del grupo de edad (posición en AGE_LABELS) de cada registro.
+    Equivale a pd.cut(ages, bins=AGE_BINS, right=False).cat.codes, pero con np.searchsorted
+    sobre los enteros, sin construir un Categorical.
+
+    Args:
+        ages (Series): Serie con los valores de GRUPO_EDAD1.
+
+    Returns:
+        numpy.ndarray: Códigos de grupo de edad (-1 si el valor está fuera de los intervalos).
+    """
+    codes = np.searchsorted(AGE_BINS, ages.to_numpy(), side='right') - 1
+    codes[codes >= len(AGE_LABELS)] = -1
+
+    return codes
+
+
+def read_csv_dataset(name):
+    """
+    Lee un conjunto de datos desde su archivo CSV aplicando las opciones definidas en DATASETS y reduciendo
+    las columnas enteras con pd.to_numeric(downcast='integer').
+    Usa el lector CSV de pyarrow (multihilo, en C++) en lugar del motor de C de pandas.
+
+    Args:
+        name (str): Nombre del conjunto de datos (sin extensión).
+
+    Returns:
+        DataFrame: DataFrame con los datos del archivo CSV.
+    """
+    df = pd.read_csv(f'{DATA_PATH}{name}.csv', engine='pyarrow', **DATASETS[name])
+
+    # Reducir cada columna entera al tipo más pequeño que admiten sus valores (en lugar de int64)
+    for column in df.select_dtypes(np.integer):
+        df[column] = pd.to_numeric(df[column], downcast='integer')
+
+    # El motor pyarrow asigna las categorías en orden de aparición; ordenarlas para conservar los mismos códigos
+    for column in df.select_dtypes('category'):
+        df[column] = df[column].cat.reorder_categories(sorted(df[column].cat.categories))
 
+    return df
+
+
+def write_parquet_dataset(name, df):
+    """
+    Guarda un conjunto de datos en formato Parquet (snappy) junto a su archivo CSV, conservando los tipos.
+    Escribe en un archivo temporal y lo reemplaza, para que otro proceso no lea un archivo incompleto.
+
+    Args:
+        name (str): Nombre del conjunto de datos (sin extensión).
+        df (DataFrame): DataFrame con los datos del conjunto.
+
+    Returns:
+        str: Ruta del archivo Parquet generado.
+    """
+    parquet_path = f'{DATA_PATH}{name}.parquet'
+    fd, tmp_path = tempfile.mkstemp(dir=DATA_PATH, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            df.to_parquet(f, engine='pyarrow', compression='snappy', index=False)
+        os.replace(tmp_path, parquet_path)
+    finally:
+        # Si la escritura o el reemplazo fallan, no dejar el archivo temporal en el directorio de datos
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return parquet_path
+
+
+def read_dataset(name):
+    """
+    Lee un conjunto de datos, usando la versión Parquet si existe y está actualizada, y el CSV en caso contrario.
+    Cuando se lee el CSV, se guarda su versión Parquet para que los siguientes arranques no tengan que analizarlo.
+    La versión Parquet se considera desactualizada si es anterior al CSV o a este módulo (que define los tipos).
+    Como es una copia derivada del CSV, si no se puede leer (por ejemplo, un archivo incompleto) se vuelve
+    a leer el CSV y se reescribe.
+
+    Args:
+        name (str): Nombre del conjunto de datos (sin extensión).
+
+    Returns:
+        DataFrame: DataFrame con los datos del conjunto.
+    """
+    csv_path = f'{DATA_PATH}{name}.csv'
+    parquet_path = f'{DATA_PATH}{name}.parquet'
+    source_paths = [path for path in (csv_path, __file__) if os.path.exists(path)]
+    if os.path.exists(parquet_path) and all(
+            os.path.getmtime(parquet_path) >= os.path.getmtime(path) for path in source_paths):
+        try:
+            return pd.read_parquet(parquet_path, engine='pyarrow')
+        except Exception as e:
+            print(f"No fue posible leer la versión Parquet de '{name}', se usará el CSV: {e}")
+
+    df = read_csv_dataset(name)
+
+    # La copia Parquet es opcional: cualquier error al guardarla no impide usar los datos del CSV
+    try:
+        write_parquet_dataset(name, df)
+    except Exception as e:
+        print(f"No fue posible guardar la versión Parquet de '{name}': {e}")
+
+    return df
+
+
+def lookup_by_cod_dane(df_divipola, cod_dane, column):
+    """
+    Obtiene el valor de una columna de divipola para cada código DANE, sin combinar DataFrames.
+    Usa un arreglo indexado por COD_DANE con el código de categoría de cada valor, de modo que la
+    búsqueda es un solo acceso vectorizado (take) sobre enteros.
+
+    Args:
+        df_divipola (DataFrame): DataFrame de divipola (códigos DANE únicos).
+        cod_dane (Series): Serie con los códigos DANE a buscar.
+        column (str): Columna de divipola a obtener (por ejemplo, 'DEPARTAMENTO' o 'MUNICIPIO').
+
+    Returns:
+        Categorical: Valores de la columna para cada código DANE (NaN si el código no existe en divipola).
+    """
+    values = df_divipola[column].astype('category')
+    divipola_codes = df_divipola['COD_DANE'].to_numpy()
+
+    # Tabla de búsqueda: posición = COD_DANE, valor = código de categoría (-1 si no existe)
+    lookup_table = np.full(divipola_codes.max() + 1, -1, dtype=np.int16)
+    lookup_table[divipola_codes] = values.cat.codes.to_numpy()
+
+    # Buscar cada código DANE (los códigos fuera de la tabla quedan como desconocidos)
+    cod_dane = cod_dane.to_numpy()
+    in_table = (cod_dane >= 0) & (cod_dane < len(lookup_table))
+    category_codes = np.full(len(cod_dane), -1, dtype=np.int16)
+    category_codes[in_table] = lookup_table.take(cod_dane[in_table])
+
+    # Conservar solo las categorías presentes (como remove_unused_categories, pero contando con
+    # np.bincount en lugar de ordenar todos los códigos); la posición extra mantiene el -1 como desconocido
+    used = np.bincount(category_codes[category_codes >= 0], minlength=len(values.cat.categories)) > 0
+    remap = np.full(len(used) + 1, -1, dtype=np.int16)
+    remap[:-1][used] = np.arange(used.sum())
+
+    return pd.Categorical.from_codes(remap[category_codes], categories=values.cat.categories[used])
+
+
+def count_by_categories(columns, count_name, mask=None):
+    """
+    Cuenta las filas por cada combinación observada de una o varias columnas categóricas.
+    Equivale a groupby(columns, observed=True).size(), pero cuenta con np.bincount sobre los
+    códigos enteros de las categorías en lugar de construir tablas hash.
+
+    Args:
+        columns (list): Lista de Series categóricas por las que se agrupa.
+        count_name (str): Nombre de la columna con el conteo.
+        mask (numpy.ndarray, optional): Máscara booleana con las filas a contar. Si es None, cuenta todas.
+
+    Returns:
+        DataFrame: DataFrame con una columna por cada Series de agrupación y la columna de conteo,
+                   ordenado por los códigos de las categorías.
+    """
+    # Desplazar los códigos en 1: la posición 0 de cada dimensión acumula los valores desconocidos (código -1)
+    codes = [column.cat.codes.to_numpy().astype(np.intp) + 1 for column in columns]
+    sizes = [len(column.cat.categories) + 1 for column in columns]
+
+    # Combinar los códigos de todas las columnas en un solo índice (en orden C, como np.ravel_multi_index,
+    # pero sin validar rangos ni recorrer los códigos cuando hay una sola columna) y contar en una sola
+    # pasada, usando la máscara como pesos en lugar de seleccionar primero las filas
+    flat_codes = codes[0]
+    for column_codes, size in zip(codes[1:], sizes[1:]):
+        flat_codes = flat_codes * size + column_codes
+    if mask is None:
+        counts = np.bincount(flat_codes, minlength=int(np.prod(sizes)))
+    else:
+        counts = np.bincount(flat_codes, weights=mask, minlength=int(np.prod(sizes))).astype(np.int64)
+
+    # Descartar las posiciones de valores desconocidos y conservar solo las combinaciones observadas
+    counts = counts.reshape(sizes)[(slice(1, None),) * len(sizes)].ravel()
+    observed = np.flatnonzero(counts)
+    result = {
+        column.name: pd.Categorical.from_codes(column_codes, dtype=column.dtype)
+        for column, column_codes in zip(columns, np.unravel_index(observed, [size - 1 for size in sizes]))
+    }
+    result[count_name] = counts[observed]
+
+    return pd.DataFrame(result)
+
+
+def integer_code_sizes(df_mortality):
+    """
+    Calcula el número de códigos (valor máximo más uno) de cada columna de enteros, que es el tamaño de
+    la tabla de búsqueda de filter_mask para esa columna. Se calcula una sola vez al cargar los datos.
+
+    Args:
+        df_mortality (DataFrame): DataFrame con los datos de mortalidad.
+
+    Returns:
+        dict: Número de códigos por columna de enteros.
+    """
+    return {column: int(df_mortality[column].max()) + 1 for column in df_mortality.select_dtypes(np.integer)}
+
+
+def filter_mask(df_mortality, filters, code_sizes=None):
+    """
+    Construye una máscara booleana con todos los filtros en una sola pasada por columna.
+    Para cada columna se crea una tabla pequeña indexada por código (categoría o valor entero)
+    que indica si el código está seleccionado, y la máscara se obtiene indexando esa tabla con
+    los códigos de cada fila, en lugar de hacer un isin con tabla hash por cada filtro.
+
+    Args:
+        df_mortality (DataFrame): DataFrame con los datos de mortalidad.
+        filters (dict): Valores seleccionados por columna (categórica o de enteros no negativos).
+                        Los filtros vacíos se ignoran.
+        code_sizes (dict, optional): Número de códigos de cada columna de enteros, calculado con
+                                     integer_code_sizes. Las columnas que no incluye se recorren
+                                     para obtener su valor máximo.
+
+    Returns:
+        numpy.ndarray: Máscara booleana con las filas que cumplen todos los filtros, o None si no hay filtros.
+    """
+    mask = None
+    for column, values in filters.items():
+        if not values:
+            continue
+
+        series = df_mortality[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy()
+            selected_codes = series.cat.categories.get_indexer(values)
+            size = len(series.cat.categories)
+        else:
+            codes = series.to_numpy()
+            selected_codes = np.asarray(values)
+            size = (code_sizes or {}).get(column)
+            if size is None:
+                size = int(codes.max()) + 1
+
+        # Tabla de búsqueda con una posición extra (falsa) para el código -1 de los valores desconocidos
+        lookup_table = np.zeros(size + 1, dtype=bool)
+        lookup_table[selected_codes[(selected_codes >= 0) & (selected_codes < size)]] = True
+
+        column_mask = lookup_table[codes]
+        mask = column_mask if mask is None else mask & column_mask
+
+    return mask
+
+
+@functools.lru_cache(maxsize=1)
 def load_data():
     """
     Carga y retorna los conjuntos de datos necesarios para la aplicación.
+    El resultado se memoiza, por lo que los archivos solo se leen una vez por proceso.
+
+    El DataFrame de mortalidad se retorna ya con los nombres de divipola (columnas DEPARTAMENTO y
+    MUNICIPIO), con la columna GENDER y con la marca booleana HOMICIDE, de modo que los procesamientos
+    posteriores no necesitan repetir la combinación ni el filtro de homicidios en cada llamada.
+    Las columnas de código y descripción de df_codes se renombran según CODES_COLUMNS (COD y DESC).
 
     Returns:
         tuple: Tupla con tres DataFrames (df_mortality, df_codes, df_divipola)
@@ -22,9 +302,36 @@ def load_data():
         Exception: Si ocurre algún otro error durante la carga de los archivos.
     """
     try:
-        df_mortality = pd.read_csv(f'{DATA_PATH}NoFetal2019.csv')
-        df_codes = pd.read_csv(f'{DATA_PATH}CodigosDeMuerte.csv', delimiter=';')
-        df_divipola = pd.read_csv(f'{DATA_PATH}Divipola.csv', delimiter=';')
+        df_mortality = read_dataset('NoFetal2019')
+        df_codes = read_dataset('CodigosDeMuerte').rename(columns=CODES_COLUMNS)
+        df_divipola = read_dataset('Divipola')
+
+        # Obtener una sola vez los nombres de departamentos y municipios desde divipola (como categorías)
+        for column in ('DEPARTAMENTO', 'MUNICIPIO'):
+            df_mortality[column] = lookup_by_cod_dane(df_divipola, df_mortality['COD_DANE'], column)
+
+        # Mapear códigos de género a nombres (como categoría para reducir memoria y acelerar isin/groupby):
+        # los códigos de SEXO indexan una tabla con la posición de cada nombre en GENDER_NAMES, en lugar
+        # de buscar cada fila en el diccionario (los códigos desconocidos quedan como -1)
+        gender_lookup = np.full(max(GENDER_NAMES) + 1, -1, dtype=np.int8)
+        gender_lookup[list(GENDER_NAMES)] = np.arange(len(GENDER_NAMES))
+        sexo = df_mortality['SEXO'].to_numpy()
+        in_table = (sexo >= 0) & (sexo < len(gender_lookup))
+        gender_codes = np.full(len(sexo), -1, dtype=np.int8)
+        gender_codes[in_table] = gender_lookup[sexo[in_table]]
+        df_mortality['GENDER'] = pd.Categorical.from_codes(gender_codes, categories=list(GENDER_NAMES.values()))
+
+        # Marcar una sola vez los registros de homicidio (MANERA_MUERTE="Homicidio"), que se reutilizan
+        # en cada actualización del gráfico de ciudades más violentas
+        df_mortality['HOMICIDE'] = filter_mask(df_mortality, {'MANERA_MUERTE': ['Homicidio']})
+
+        # Usar las mismas categorías para COD_MUERTE y para el código CIE-10 de df_codes, de modo que
+        # la combinación con los códigos de muerte compare códigos enteros en lugar de cadenas
+        death_code_dtype = pd.CategoricalDtype(sorted(
+            set(df_mortality['COD_MUERTE'].cat.categories) | set(df_codes['COD'].dropna())
+        ))
+        df_mortality['COD_MUERTE'] = df_mortality['COD_MUERTE'].astype(death_code_dtype)
+        df_codes['COD'] = df_codes['COD'].astype(death_code_dtype)
 
         print("Archivos cargados exitosamente.")
         return df_mortality, df_codes, df_divipola
@@ -38,26 +345,18 @@ def load_data():
         exit()
 
 
-def process_data_for_department_map(df_mortality, df_divipola):
+def process_data_for_department_map(df_mortality):
     """
     Procesa los datos para la visualización del mapa de departamentos.
 
     Args:
-        df_mortality (DataFrame): DataFrame con los datos de mortalidad.
-        df_divipola (DataFrame): DataFrame con los datos de división política de Colombia.
+        df_mortality (DataFrame): DataFrame con los datos de mortalidad (con la columna DEPARTAMENTO).
 
     Returns:
         DataFrame: DataFrame con el conteo de muertes por departamento.
     """
-    # Combinar datos de mortalidad con divipola para obtener nombres de departamentos
-    df_mortality_with_dept = df_mortality.merge(
-        df_divipola[['COD_DANE', 'COD_DEPARTAMENTO', 'DEPARTAMENTO']],
-        on='COD_DANE',
-        how='left'
-    )
-
     # Contar muertes por departamento
-    deaths_by_dept = df_mortality_with_dept.groupby('DEPARTAMENTO').size().reset_index(name='TOTAL_DEATHS')
+    deaths_by_dept = count_by_categories([df_mortality['DEPARTAMENTO']], 'TOTAL_DEATHS')
 
     return deaths_by_dept
 
@@ -72,84 +371,72 @@ def process_data_for_monthly_deaths(df_mortality):
     Returns:
         DataFrame: DataFrame con el conteo de muertes por mes.
     """
-    # Contar muertes por mes
-    deaths_by_month = df_mortality.groupby('MES').size().reset_index(name='TOTAL_DEATHS')
-    deaths_by_month = deaths_by_month.sort_values('MES')
-
-    # Mapear números de mes a nombres de mes
-    deaths_by_month['MONTH_NAME'] = deaths_by_month['MES'].map(MONTH_NAMES)
+    # Contar muertes por mes (np.bincount sobre los números de mes, ya ordenados)
+    months = df_mortality['MES']
+    counts = np.bincount(months.to_numpy(), minlength=13)
+    observed_months = np.flatnonzero(counts)
+    # Los nombres de mes forman una categoría ordenada (de enero a diciembre), construida directamente
+    # a partir de los números de mes observados (los códigos de la categoría son el mes menos uno)
+    deaths_by_month = pd.DataFrame({
+        'MES': observed_months.astype(months.dtype),
+        'TOTAL_DEATHS': counts[observed_months],
+        'MONTH_NAME': pd.Categorical.from_codes(observed_months - 1, categories=[MONTH_NAMES[month] for month in sorted(MONTH_NAMES)],
+                                                ordered=True)
+    })
 
     return deaths_by_month
 
 
-def process_data_for_violent_cities(df_mortality, df_divipola, df_codes=None, violent_types=None):
+def process_data_for_violent_cities(df_mortality, df_codes=None, violent_types=None, mask=None):
     """
     Procesa los datos para el gráfico de barras de las ciudades más violentas.
     Considera homicidios (filtrados por MANERA_MUERTE="Homicidio" y relacionados con sus descripciones).
 
     Args:
-        df_mortality (DataFrame): DataFrame con los datos de mortalidad.
-        df_divipola (DataFrame): DataFrame con los datos de división política de Colombia.
+        df_mortality (DataFrame): DataFrame con los datos de mortalidad (con las columnas MUNICIPIO y HOMICIDE).
         df_codes (DataFrame, optional): DataFrame con los códigos de causas de muerte.
         violent_types (list, optional): Lista de tipos de muertes violentas a incluir.
                                        Si es None, incluye todos los tipos de homicidios.
+        mask (numpy.ndarray, optional): Máscara booleana con las filas a considerar. Si es None, considera todas.
 
     Returns:
         DataFrame: DataFrame con las 5 ciudades con más homicidios.
     """
-    # Crear una copia del DataFrame para no modificar el original
-    df = df_mortality.copy()
-
-    # Filtrar solo los registros donde MANERA_MUERTE es "Homicidio"
-    homicides = df[df['MANERA_MUERTE'] == 'Homicidio']
-
-    # Si se proporcionan tipos específicos de homicidios, filtrar por ellos
-    if violent_types and len(violent_types) > 0:
-        # Filtrar solo por los tipos seleccionados
-        homicides = homicides[homicides['COD_MUERTE'].isin(violent_types)]
-
-    # Combinar con divipola para obtener nombres de ciudades
-    homicides_with_city = homicides.merge(
-        df_divipola[['COD_DANE', 'MUNICIPIO']],
-        on='COD_DANE',
-        how='left'
-    )
+    # Partir de la marca precalculada de homicidios y filtrar, si se proporcionan, por los tipos específicos
+    # (sin modificar en el lugar el arreglo de la columna HOMICIDE)
+    homicide_mask = df_mortality['HOMICIDE'].to_numpy()
+    for extra_mask in (filter_mask(df_mortality, {'COD_MUERTE': violent_types}), mask):
+        if extra_mask is not None:
+            homicide_mask = homicide_mask & extra_mask
 
     # Contar homicidios por ciudad
-    homicides_by_city = homicides_with_city.groupby('MUNICIPIO').size().reset_index(name='HOMICIDES')
+    homicides_by_city = count_by_categories([df_mortality['MUNICIPIO']], 'HOMICIDES', homicide_mask)
 
     # Obtener las 5 ciudades con más homicidios
-    top_violent_cities = homicides_by_city.sort_values('HOMICIDES', ascending=False).head(5)
+    top_violent_cities = homicides_by_city.nlargest(5, 'HOMICIDES')
 
     return top_violent_cities
 
 
-def process_data_for_lowest_mortality_cities(df_mortality, df_divipola):
+def process_data_for_lowest_mortality_cities(df_mortality, mask=None):
     """
     Procesa los datos para el gráfico circular de ciudades con menor mortalidad.
 
     Args:
-        df_mortality (DataFrame): DataFrame con los datos de mortalidad.
-        df_divipola (DataFrame): DataFrame con los datos de división política de Colombia.
+        df_mortality (DataFrame): DataFrame con los datos de mortalidad (con la columna MUNICIPIO).
+        mask (numpy.ndarray, optional): Máscara booleana con las filas a considerar. Si es None, considera todas.
 
     Returns:
         DataFrame: DataFrame con las 10 ciudades con menor mortalidad.
     """
-    # Combinar datos de mortalidad con divipola para obtener nombres de ciudades
-    mortality_with_city = df_mortality.merge(
-        df_divipola[['COD_DANE', 'MUNICIPIO']],
-        on='COD_DANE',
-        how='left'
-    )
-
     # Contar muertes por ciudad
-    deaths_by_city = mortality_with_city.groupby('MUNICIPIO').size().reset_index(name='DEATHS')
+    deaths_by_city = count_by_categories([df_mortality['MUNICIPIO']], 'DEATHS', mask)
 
     # Obtener ciudades con al menos algunas muertes para evitar ceros
     deaths_by_city = deaths_by_city[deaths_by_city['DEATHS'] > 0]
 
     # Obtener 10 ciudades con menor mortalidad
-    lowest_mortality_cities = deaths_by_city.sort_values('DEATHS').head(10)
+    lowest_mortality_cities = deaths_by_city.nsmallest(10, 'DEATHS')
 
     return lowest_mortality_cities
 
@@ -160,31 +447,27 @@ def process_data_for_top_causes(df_mortality, df_codes):
 
     Args:
         df_mortality (DataFrame): DataFrame con los datos de mortalidad.
-        df_codes (DataFrame): DataFrame con los códigos de causas de muerte.
+        df_codes (DataFrame): DataFrame con los códigos de causas de muerte (con las columnas COD y DESC).
 
     Returns:
         DataFrame: DataFrame con las 10 principales causas de muerte.
     """
-    # Combinar datos de mortalidad con códigos para obtener descripciones de causas
-    mortality_with_codes = df_mortality.merge(
-        df_codes[['Código de la CIE-10 cuatro caracteres', 'Descripcion  de códigos mortalidad a cuatro caracteres']],
-        left_on='COD_MUERTE',
-        right_on='Código de la CIE-10 cuatro caracteres',
-        how='left'
-    )
+    # Contar muertes por código de causa, sin combinar todas las filas con las descripciones
+    deaths_by_cause = count_by_categories([df_mortality['COD_MUERTE']], 'TOTAL')
 
-    # Contar muertes por causa
-    deaths_by_cause = mortality_with_codes.groupby([
-        'COD_MUERTE', 'Descripcion  de códigos mortalidad a cuatro caracteres'
-    ]).size().reset_index(name='TOTAL')
+    # Agregar la descripción solo a los códigos observados, con un diccionario de código -> descripción;
+    # las causas sin descripción se descartan, como ocurría al agrupar después de la combinación
+    code_to_desc = dict(zip(df_codes['COD'], df_codes['DESC']))
+    deaths_by_cause.insert(1, 'DESC', deaths_by_cause['COD_MUERTE'].astype(object).map(code_to_desc))
+    deaths_by_cause = deaths_by_cause.dropna(subset=['DESC'])
 
     # Obtener las 10 principales causas
-    top_causes = deaths_by_cause.sort_values('TOTAL', ascending=False).head(10)
+    top_causes = deaths_by_cause.nlargest(10, 'TOTAL')
 
     # Renombrar columnas para mayor claridad
     top_causes = top_causes.rename(columns={
         'COD_MUERTE': 'Código',
-        'Descripcion  de códigos mortalidad a cuatro caracteres': 'Descripción',
+        'DESC': 'Descripción',
         'TOTAL': 'Total de Casos'
     })
 
@@ -201,22 +484,17 @@ def process_data_for_age_histogram(df_mortality):
     Returns:
         DataFrame: DataFrame con el conteo de muertes por grupo de edad.
     """
-    # Crear una copia del DataFrame para no modificar el original
-    df = df_mortality.copy()
-
-    # Definir grupos de edad
-    age_bins = [0, 5, 10, 15, 20, 25, 30, 35, 40, 45, 50, 55, 60, 65, 70, 75, 80, 85, 90, 95, 100, 150]
-    age_labels = [
-        '0-4', '5-9', '10-14', '15-19', '20-24', '25-29', '30-34', '35-39', '40-44',
-        '45-49', '50-54', '55-59', '60-64', '65-69', '70-74', '75-79', '80-84',
-        '85-89', '90-94', '95-99', '100+'
-    ]
-
-    # Asignar grupos de edad
-    df['AGE_GROUP'] = pd.cut(df['GRUPO_EDAD1'], bins=age_bins, labels=age_labels, right=False)
-
-    # Contar muertes por grupo de edad
-    deaths_by_age = df.groupby('AGE_GROUP').size().reset_index(name='COUNT')
+    # Contar primero los registros de cada valor de GRUPO_EDAD1 (enteros pequeños no negativos), sin
+    # modificar ni copiar el DataFrame; así np.searchsorted solo se aplica a los pocos valores distintos
+    value_counts = np.bincount(df_mortality['GRUPO_EDAD1'].to_numpy())
+    age_codes = age_group_codes(pd.Series(np.arange(len(value_counts))))
+
+    # Sumar los conteos por grupo de edad (incluyendo grupos sin registros); los códigos se desplazan
+    # en 1 para que los valores fuera de los intervalos (-1) caigan en la posición 0 y se descarten
+    deaths_by_age = pd.DataFrame({
+        'AGE_GROUP': pd.Categorical(AGE_LABELS, dtype=AGE_GROUP_DTYPE),
+        'COUNT': np.bincount(age_codes + 1, weights=value_counts, minlength=len(AGE_LABELS) + 1)[1:].astype(np.int64)
+    })
 
     return deaths_by_age
 
@@ -226,27 +504,26 @@ def get_homicide_codes_with_descriptions(df_mortality, df_codes):
     Obtiene los códigos de muerte por homicidio con sus descripciones.
 
     Args:
-        df_mortality (DataFrame): DataFrame con los datos de mortalidad.
-        df_codes (DataFrame): DataFrame con los códigos de causas de muerte.
+        df_mortality (DataFrame): DataFrame con los datos de mortalidad (con la columna HOMICIDE).
+        df_codes (DataFrame): DataFrame con los códigos de causas de muerte (con las columnas COD y DESC).
 
     Returns:
         dict: Diccionario con códigos de homicidio como claves y descripciones como valores.
         list: Lista de tuplas (código, descripción) para usar en filtros.
     """
-    # Filtrar solo los registros donde MANERA_MUERTE es "Homicidio"
-    homicides = df_mortality[df_mortality['MANERA_MUERTE'] == 'Homicidio']
+    # Contar los homicidios por categoría de COD_MUERTE con np.bincount sobre los códigos de las filas
+    # marcadas (sin extraer las filas ni buscar valores únicos); la posición 0 corresponde a los códigos desconocidos
+    death_codes = df_mortality['COD_MUERTE'].cat
+    homicide_codes = death_codes.codes.to_numpy()[df_mortality['HOMICIDE'].to_numpy()]
+    homicide_counts = np.bincount(homicide_codes.astype(np.intp) + 1, minlength=len(death_codes.categories) + 1)
+    homicide_counts[0] = 0
 
-    # Obtener códigos únicos de homicidio
-    unique_homicide_codes = homicides['COD_MUERTE'].unique()
-
-    # Relacionar códigos con descripciones
-    homicide_codes_with_desc = df_codes[df_codes['Código de la CIE-10 cuatro caracteres'].isin(unique_homicide_codes)]
+    # Relacionar códigos con descripciones: df_codes comparte las categorías de COD_MUERTE, por lo que
+    # sus filas de homicidio se seleccionan indexando los conteos con sus códigos (sin isin)
+    is_homicide_code = homicide_counts[df_codes['COD'].cat.codes.to_numpy().astype(np.intp) + 1] > 0
 
     # Crear diccionario de código -> descripción
-    code_to_desc = dict(zip(
-        homicide_codes_with_desc['Código de la CIE-10 cuatro caracteres'],
-        homicide_codes_with_desc['Descripcion  de códigos mortalidad a cuatro caracteres']
-    ))
+    code_to_desc = dict(zip(df_codes.loc[is_homicide_code, 'COD'], df_codes.loc[is_homicide_code, 'DESC']))
 
     # Crear lista de tuplas (código, descripción) para usar en filtros
     code_desc_list = [{'label': f"{code} - {desc}", 'value': code} for code, desc in code_to_desc.items()]
@@ -254,29 +531,141 @@ def get_homicide_codes_with_descriptions(df_mortality, df_codes):
     return code_desc_list
 
 
-def process_data_for_gender_department(df_mortality, df_divipola):
+def select_top_departments(deaths_by_dept_gender, n=10):
+    """
+    Selecciona las filas de los departamentos con más muertes.
+
+    Args:
+        deaths_by_dept_gender (DataFrame): DataFrame con datos de muertes por género y departamento.
+        n (int, optional): Número de departamentos a conservar.
+
+    Returns:
+        DataFrame: DataFrame con solo los n departamentos con más muertes.
+    """
+    # Obtener los n departamentos con más muertes
+    top_depts = deaths_by_dept_gender.groupby('DEPARTAMENTO', observed=True, sort=False)['COUNT'].sum().nlargest(n).index.tolist()
+
+    return deaths_by_dept_gender[deaths_by_dept_gender['DEPARTAMENTO'].isin(top_depts)]
+
+
+def process_data_for_gender_department(df_mortality):
     """
     Procesa los datos para el gráfico de muertes por género y departamento.
 
+    Args:
+        df_mortality (DataFrame): DataFrame con los datos de mortalidad (con las columnas DEPARTAMENTO y GENDER).
+
+    Returns:
+        DataFrame: DataFrame con el conteo de muertes por género de los 10 departamentos con más muertes.
+    """
+    # Contar muertes por departamento y género
+    deaths_by_dept_gender = count_by_categories([df_mortality['DEPARTAMENTO'], df_mortality['GENDER']], 'COUNT')
+
+    # Conservar los 10 departamentos con más muertes (el gráfico recibe los datos ya filtrados)
+    return select_top_departments(deaths_by_dept_gender)
+
+
+def build_mortality_cube(df_mortality):
+    """
+    Construye un cubo de conteos de muertes por departamento, mes, sexo, manera de muerte y grupo de edad.
+    Es lo bastante pequeño para enviarse al navegador, donde los callbacks del lado del cliente lo filtran
+    y suman para actualizar las gráficas sin consultar al servidor.
+
+    Args:
+        df_mortality (DataFrame): DataFrame con los datos de mortalidad (con la columna DEPARTAMENTO).
+
+    Returns:
+        dict: Diccionario serializable a JSON con los nombres de cada dimensión y, en formato columnar,
+              los códigos de cada dimensión ('dept', 'month', 'sex', 'manner', 'age') y su conteo ('count').
+              Los departamentos o grupos de edad desconocidos tienen código -1.
+    """
+    # Agrupar por los códigos de cada dimensión (sin ordenar los grupos: el navegador solo suma las filas)
+    dimensions = pd.DataFrame({
+        'dept': df_mortality['DEPARTAMENTO'].cat.codes,
+        'month': df_mortality['MES'],
+        'sex': df_mortality['SEXO'],
+        'manner': df_mortality['MANERA_MUERTE'].cat.codes,
+        'age': age_group_codes(df_mortality['GRUPO_EDAD1'])
+    })
+    cube = dimensions.groupby(list(dimensions.columns), sort=False).size().reset_index(name='count')
+
+    return {
+        'departments': df_mortality['DEPARTAMENTO'].cat.categories.tolist(),
+        'manners': df_mortality['MANERA_MUERTE'].cat.categories.tolist(),
+        'month_names': [MONTH_NAMES[month] for month in sorted(MONTH_NAMES)],
+        'gender_names': [GENDER_NAMES[code] for code in sorted(GENDER_NAMES)],
+        'age_groups': AGE_LABELS,
+        **{column: cube[column].tolist() for column in cube.columns}
+    }
+
+
+def build_count_cube(df_mortality, dimensions=('DEPARTAMENTO', 'GENDER', 'MES', 'MANERA_MUERTE')):
+    """
+    Construye un cubo de conteos de muertes indexado por las dimensiones indicadas.
+    Los callbacks del servidor lo filtran y suman en lugar de agrupar todas las filas en cada petición.
+
     Args:
         df_mortality (DataFrame): DataFrame con los datos de mortalidad.
-        df_divipola (DataFrame): DataFrame con los datos de división política de Colombia.
+        dimensions (tuple, optional): Columnas que forman los niveles del índice del cubo.
 
     Returns:
-        DataFrame: DataFrame con el conteo de muertes por género y departamento.
+        Series: Serie con el número de muertes por cada combinación observada de las dimensiones.
     """
-    # Combinar datos de mortalidad con divipola para obtener nombres de departamentos
-    df_mortality_with_dept = df_mortality.merge(
-        df_divipola[['COD_DANE', 'COD_DEPARTAMENTO', 'DEPARTAMENTO']],
-        on='COD_DANE',
-        how='left'
-    )
+    # El cubo se ordena una sola vez con sort_index, por lo que groupby no necesita ordenar los grupos
+    return df_mortality.groupby(list(dimensions), observed=True, sort=False).size().sort_index()
 
-    # Mapear códigos de género a nombres
-    gender_mapping = {1: 'Masculino', 2: 'Femenino', 3: 'Indeterminado'}
-    df_mortality_with_dept['GENDER'] = df_mortality_with_dept['SEXO'].map(gender_mapping)
 
-    # Contar muertes por departamento y género
-    deaths_by_dept_gender = df_mortality_with_dept.groupby(['DEPARTAMENTO', 'GENDER']).size().reset_index(name='COUNT')
+def sum_count_cube(count_cube, by, filters=None):
+    """
+    Suma los conteos del cubo que cumplen los filtros, agrupados por las dimensiones indicadas.
+
+    Args:
+        count_cube (Series): Cubo de conteos construido con build_count_cube.
+        by (list): Dimensiones por las que se agrupa el resultado.
+        filters (dict, optional): Valores seleccionados por dimensión. Los filtros vacíos se ignoran.
+
+    Returns:
+        Series: Serie con el número de muertes por cada combinación de las dimensiones de agrupación.
+    """
+    # Construir una máscara booleana sobre los niveles del índice
+    mask = None
+    for dimension, values in (filters or {}).items():
+        if values:
+            dimension_mask = count_cube.index.get_level_values(dimension).isin(values)
+            mask = dimension_mask if mask is None else mask & dimension_mask
+
+    sliced_cube = count_cube if mask is None else count_cube.loc[mask]
 
-    return deaths_by_dept_gender
+    return sliced_cube.groupby(level=by, observed=True).sum()
+
+
+def precompute_all(df_mortality, df_codes):
+    """
+    Calcula una sola vez, al iniciar la aplicación, todos los datos que no dependen de los filtros:
+    los agregados de las visualizaciones iniciales, las opciones del filtro de homicidios y los cubos
+    de conteos que usan los callbacks. Así las peticiones solo calculan las variantes filtradas.
+
+    Args:
+        df_mortality (DataFrame): DataFrame con los datos de mortalidad cargado por load_data.
+        df_codes (DataFrame): DataFrame con los códigos de causas de muerte cargado por load_data.
+
+    Returns:
+        dict: Diccionario con los DataFrames de cada visualización inicial ('deaths_by_dept', 'deaths_by_month',
+              'deaths_by_age', 'top_violent_cities', 'lowest_mortality_cities', 'top_causes',
+              'deaths_by_dept_gender'), las opciones de homicidio ('homicide_code_desc_list') y los cubos
+              de conteos ('mortality_cube' para el navegador y 'count_cube' para los callbacks del servidor)
+              y el número de códigos de las columnas de enteros para filter_mask ('code_sizes').
+    """
+    return {
+        'deaths_by_dept': process_data_for_department_map(df_mortality),
+        'deaths_by_month': process_data_for_monthly_deaths(df_mortality),
+        'deaths_by_age': process_data_for_age_histogram(df_mortality),
+        'top_violent_cities': process_data_for_violent_cities(df_mortality, df_codes),
+        'lowest_mortality_cities': process_data_for_lowest_mortality_cities(df_mortality),
+        'top_causes': process_data_for_top_causes(df_mortality, df_codes),
+        'deaths_by_dept_gender': process_data_for_gender_department(df_mortality),
+        'homicide_code_desc_list': get_homicide_codes_with_descriptions(df_mortality, df_codes),
+        'mortality_cube': build_mortality_cube(df_mortality),
+        'count_cube': build_count_cube(df_mortality),
+        'code_sizes': integer_code_sizes(df_mortality)
+    }
@@ -6,6 +6,16 @@ Contiene funciones para crear las diferentes secciones del layout.
 from dash import html, dcc
 from src.utils.utils import create_filter_card, card_style, title_style, button_style, filter_area_style
 
+# Estilos derivados de los estilos comunes, combinados una sola vez al importar el módulo
+header_title_style = {**title_style, 'margin': '0', 'padding': '20px'}
+section_title_style = {**title_style, 'marginBottom': '20px'}
+card_title_style = {**title_style, 'marginBottom': '15px'}
+padded_card_style = {**card_style, 'padding': '20px'}
+footer_card_style = {**padded_card_style, 'marginBottom': '20px'}
+filters_title_style = {'marginTop': '10px', 'fontWeight': 'bold', 'color': '#2c3e50', 'textAlign': 'center'}
+filter_row_style = {'display': 'flex', 'gap': '10px', 'justifyContent': 'space-between'}
+spaced_button_style = {**button_style, 'marginRight': '10px'}
+
 def create_header():
     """
     Crea el encabezado de la aplicación con un título principal en una tarjeta con estilos innovadores.
@@ -16,7 +26,7 @@ def create_header():
     return html.Div([
         html.Div([
             html.H1('📊 Análisis de Mortalidad en Colombia (2019)',
-                   style={**title_style, 'margin': '0', 'padding': '20px'})
+                   style=header_title_style)
         ], style={
             'backgroundColor': 'white',
             'borderRadius': '15px',
@@ -32,7 +42,7 @@ def create_map_section(map_fig, manners_of_death, months, genders):
     Crea la sección del mapa con filtros.
 
     Args:
-        map_fig (plotly.graph_objects.Figure): Figura del mapa.
+        map_fig (dict): Figura del mapa.
         manners_of_death (list): Lista de maneras de muerte para el filtro.
         months (list): Lista de meses para el filtro.
         genders (list): Lista de géneros para el filtro.
@@ -44,7 +54,7 @@ def create_map_section(map_fig, manners_of_death, months, genders):
         # Contenedor principal con estilo de tarjeta
         html.Div([
             html.H3("Muertes por Departamento", 
-                    style={**title_style, 'marginBottom': '20px'}),
+                    style=section_title_style),
 
             # Mapa primero
             html.Div([
@@ -74,7 +84,7 @@ def create_map_section(map_fig, manners_of_death, months, genders):
             ], style={'padding': '15px', 'backgroundColor': '#f5f5f5', 'borderRadius': '10px', 
                       'boxShadow': '0 2px 5px rgba(0,0,0,0.1)', 'marginTop': '20px'})
 
-        ], style={**card_style, 'padding': '20px'})
+        ], style=padded_card_style)
 
     ], style={'marginBottom': '40px'})
 
@@ -83,7 +93,7 @@ def create_monthly_deaths_section(monthly_deaths_fig, departments, genders):
     Crea la sección de muertes mensuales con filtros.
 
     Args:
-        monthly_deaths_fig (plotly.graph_objects.Figure): Figura del gráfico de muertes mensuales.
+        monthly_deaths_fig (dict): Figura del gráfico de muertes mensuales.
         departments (list): Lista de departamentos para el filtro.
         genders (list): Lista de géneros para el filtro.
 
@@ -99,11 +109,11 @@ def create_monthly_deaths_section(monthly_deaths_fig, departments, genders):
             )
         ]),
         html.Div([
-            html.H5('Filtros', style={'marginTop': '10px', 'fontWeight': 'bold', 'color': '#2c3e50', 'textAlign': 'center'}),
+            html.H5('Filtros', style=filters_title_style),
             html.Div([
                 create_filter_card("Departamento", 'monthly-dept-filter', departments),
                 create_filter_card("Género", 'monthly-gender-filter', genders)
-            ], style={'display': 'flex', 'gap': '10px', 'justifyContent': 'space-between'})
+            ], style=filter_row_style)
         ], style=filter_area_style)
     ], style=card_style)
 
@@ -112,7 +122,7 @@ def create_age_histogram_section(age_histogram_fig, departments, genders):
     Crea la sección de histograma de edad con filtros.
 
     Args:
-        age_histogram_fig (plotly.graph_objects.Figure): Figura del histograma de edad.
+        age_histogram_fig (dict): Figura del histograma de edad.
         departments (list): Lista de departamentos para el filtro.
         genders (list): Lista de géneros para el filtro.
 
@@ -128,11 +138,11 @@ def create_age_histogram_section(age_histogram_fig, departments, genders):
             )
         ]),
         html.Div([
-            html.H5('Filtros', style={'marginTop': '10px', 'fontWeight': 'bold', 'color': '#2c3e50', 'textAlign': 'center'}),
+            html.H5('Filtros', style=filters_title_style),
             html.Div([
                 create_filter_card("Departamento", 'age-dept-filter', departments),
                 create_filter_card("Género", 'age-gender-filter', genders)
-            ], style={'display': 'flex', 'gap': '10px', 'justifyContent': 'space-between'}),
+            ], style=filter_row_style),
         ], style=filter_area_style)
     ], style=card_style)
 
@@ -147,7 +157,7 @@ def create_top_causes_section(top_causes_table):
         html.Div: Componente de sección de tabla de principales causas de muerte.
     """
     return html.Div([
-        html.H3("Principales Causas de Muerte", style={**title_style, 'marginBottom': '15px'}),
+        html.H3("Principales Causas de Muerte", style=card_title_style),
         dcc.Loading(
             id="loading-top-causes",
             type="circle",
@@ -160,7 +170,7 @@ def create_violent_cities_section(violent_cities_fig, violent_types, genders):
     Crea la sección de ciudades más violentas con filtros.
 
     Args:
-        violent_cities_fig (plotly.graph_objects.Figure): Figura del gráfico de ciudades más violentas.
+        violent_cities_fig (dict): Figura del gráfico de ciudades más violentas.
         violent_types (list): Lista de tipos de muertes violentas para el filtro.
         genders (list): Lista de géneros para el filtro.
 
@@ -176,11 +186,11 @@ def create_violent_cities_section(violent_cities_fig, violent_types, genders):
             )
         ]),
         html.Div([
-            html.H5('Filtros', style={'marginTop': '10px', 'fontWeight': 'bold', 'color': '#2c3e50', 'textAlign': 'center'}),
+            html.H5('Filtros', style=filters_title_style),
             html.Div([
                 create_filter_card("Descripción de Homicidio", 'violent-manner-filter', violent_types),
                 create_filter_card("Género", 'violent-gender-filter', genders)
-            ], style={'display': 'flex', 'gap': '10px', 'justifyContent': 'space-between'}),
+            ], style=filter_row_style),
         ], style=filter_area_style)
     ], style=card_style)
 
@@ -189,7 +199,7 @@ def create_lowest_mortality_section(lowest_mortality_fig, genders):
     Crea la sección de ciudades con menor mortalidad con filtros.
 
     Args:
-        lowest_mortality_fig (plotly.graph_objects.Figure): Figura del gráfico de ciudades con menor mortalidad.
+        lowest_mortality_fig (dict): Figura del gráfico de ciudades con menor mortalidad.
         genders (list): Lista de géneros para el filtro.
 
     Returns:
@@ -204,7 +214,7 @@ def create_lowest_mortality_section(lowest_mortality_fig, genders):
             )
         ]),
         html.Div([
-            html.H5('Filtros', style={'marginTop': '10px', 'fontWeight': 'bold', 'color': '#2c3e50', 'textAlign': 'center'}),
+            html.H5('Filtros', style=filters_title_style),
             create_filter_card("Género", 'lowest-gender-filter', genders),
         ], style=filter_area_style)
     ], style=card_style)
@@ -214,7 +224,7 @@ def create_gender_dept_section(gender_dept_fig, manners_of_death, months):
     Crea la sección de muertes por género y departamento con filtros.
 
     Args:
-        gender_dept_fig (plotly.graph_objects.Figure): Figura del gráfico de muertes por género y departamento.
+        gender_dept_fig (dict): Figura del gráfico de muertes por género y departamento.
         manners_of_death (list): Lista de maneras de muerte para el filtro.
         months (list): Lista de meses para el filtro.
 
@@ -230,11 +240,11 @@ def create_gender_dept_section(gender_dept_fig, manners_of_death, months):
             )
         ]),
         html.Div([
-            html.H5('Filtros', style={'marginTop': '10px', 'fontWeight': 'bold', 'color': '#2c3e50', 'textAlign': 'center'}),
+            html.H5('Filtros', style=filters_title_style),
             html.Div([
                 create_filter_card("Manera de Muerte", 'gender-dept-manner-filter', manners_of_death),
                 create_filter_card("Mes", 'gender-dept-month-filter', months)
-            ], style={'display': 'flex', 'gap': '10px', 'justifyContent': 'space-between'}),
+            ], style=filter_row_style),
         ], style=filter_area_style)
     ], style=card_style)
 
@@ -253,13 +263,13 @@ def create_announcement_section():
         ], style={'padding': '15px', 'backgroundColor': '#f8d7da', 'borderRadius': '10px', 
                  'border': '1px solid #f5c6cb', 'color': '#721c24'}),
         html.Div([
-            html.H4("Autores", style={**title_style, 'marginBottom': '15px'}),
+            html.H4("Autores", style=card_title_style),
             html.Ul([
                 html.Li("- Bechara, Hermes", style={'fontSize': '16px', 'marginBottom': '5px'}),
                 html.Li("- Liscano, Andrés", style={'fontSize': '16px', 'marginBottom': '5px'}),
                 html.Li("- Montealegre, Efraín", style={'fontSize': '16px', 'marginBottom': '5px'})
             ], style={'listStyleType': 'none', 'padding': '0', 'margin': '0'})
-        ], style={**card_style, 'padding': '20px', 'marginBottom': '20px'})
+        ], style=footer_card_style)
     ], style={'marginBottom': '20px'})
 
 def create_data_sources_section():
@@ -270,15 +280,15 @@ def create_data_sources_section():
         html.Div: Componente de sección de fuentes de datos.
     """
     return html.Div([
-        html.H4("Fuentes de Datos", style={**title_style, 'marginBottom': '15px'}),
+        html.H4("Fuentes de Datos", style=card_title_style),
         html.P("Descargue los datos utilizados en este dashboard:", style={'marginBottom': '15px'}),
         html.Div([
             html.A(
-                html.Button("Datos de Mortalidad", style={**button_style, 'marginRight': '10px'}),
+                html.Button("Datos de Mortalidad", style=spaced_button_style),
                 href="/data/NoFetal2019.csv", download="NoFetal2019.csv"
             ),
             html.A(
-                html.Button("Códigos de Muerte", style={**button_style, 'marginRight': '10px'}),
+                html.Button("Códigos de Muerte", style=spaced_button_style),
                 href="/data/CodigosDeMuerte.csv", download="CodigosDeMuerte.csv"
             ),
             html.A(
@@ -286,32 +296,36 @@ def create_data_sources_section():
                 href="/data/Divipola.csv", download="Divipola.csv"
             )
         ], style={'display': 'flex', 'justifyContent': 'center'})
-    ], style={**card_style, 'padding': '20px', 'marginBottom': '20px'})
+    ], style=footer_card_style)
 
 def create_layout(map_fig, monthly_deaths_fig, age_histogram_fig, top_causes_table, 
                  violent_cities_fig, lowest_mortality_fig, gender_dept_fig,
-                 departments, manners_of_death, months, genders, violent_types=None):
+                 departments, manners_of_death, months, genders, violent_types=None, mortality_cube=None):
     """
     Crea el layout completo de la aplicación.
 
     Args:
-        map_fig (plotly.graph_objects.Figure): Figura del mapa.
-        monthly_deaths_fig (plotly.graph_objects.Figure): Figura del gráfico de muertes mensuales.
-        age_histogram_fig (plotly.graph_objects.Figure): Figura del histograma de edad.
+        map_fig (dict): Figura del mapa.
+        monthly_deaths_fig (dict): Figura del gráfico de muertes mensuales.
+        age_histogram_fig (dict): Figura del histograma de edad.
         top_causes_table (dash_table.DataTable): Tabla de principales causas de muerte.
-        violent_cities_fig (plotly.graph_objects.Figure): Figura del gráfico de ciudades más violentas.
-        lowest_mortality_fig (plotly.graph_objects.Figure): Figura del gráfico de ciudades con menor mortalidad.
-        gender_dept_fig (plotly.graph_objects.Figure): Figura del gráfico de muertes por género y departamento.
+        violent_cities_fig (dict): Figura del gráfico de ciudades más violentas.
+        lowest_mortality_fig (dict): Figura del gráfico de ciudades con menor mortalidad.
+        gender_dept_fig (dict): Figura del gráfico de muertes por género y departamento.
         departments (list): Lista de departamentos para los filtros.
         manners_of_death (list): Lista de maneras de muerte para los filtros.
         months (list): Lista de meses para los filtros.
         genders (list): Lista de géneros para los filtros.
         violent_types (list, optional): Lista de tipos de muertes violentas para el filtro de ciudades más violentas.
+        mortality_cube (dict, optional): Cubo de conteos usado por los callbacks del lado del cliente.
 
     Returns:
         html.Div: Layout completo de la aplicación.
     """
     return html.Div([
+        # Cubo de conteos para los callbacks del lado del cliente
+        dcc.Store(id='mortality-cube', data=mortality_cube),
+
         # Header
         create_header(),
 
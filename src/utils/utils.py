@@ -21,25 +21,39 @@ def create_filter_card(title, filter_id, options, multi=True):
     Returns:
         html.Div: Componente de tarjeta de filtro con un dropdown.
     """
-    # Verifica si options ya es una lista de diccionarios con el formato correcto
+    # dcc.Dropdown acepta directamente una lista de valores simples (cada valor es su propia etiqueta)
+    # o de diccionarios {'label': label, 'value': value}, por lo que ambas se usan sin reconstruirlas;
+    # el formato se revisa una sola vez con la primera opción
     dropdown_options = options
-    if options and not isinstance(options[0], dict):
-        dropdown_options = [{'label': opt, 'value': opt} for opt in options]
-    elif options and isinstance(options[0], dict) and not ('label' in options[0] and 'value' in options[0]):
+    first_option = options[0] if options else None
+    if isinstance(first_option, dict) and not ('label' in first_option and 'value' in first_option):
         # Si son diccionarios pero no tienen el formato correcto, intentamos convertirlos
         dropdown_options = [{'label': opt.get('label', str(opt)), 'value': opt.get('value', opt)} for opt in options]
 
+    # Los estilos son constantes del módulo, compartidas por todas las tarjetas de filtro
     return html.Div([
-        html.H5(title, style={'marginBottom': '10px', 'fontWeight': 'bold', 'color': '#2c3e50', 'textAlign': 'center'}),
+        html.H5(title, style=filter_card_title_style),
         dcc.Dropdown(
             id=filter_id,
             options=dropdown_options,
             multi=multi,
             placeholder=f'Seleccionar {title.lower()}...',
-            style={'width': '100%', 'zIndex': '9999'}
+            style=dropdown_style
         )
-    ], style={'padding': '15px', 'backgroundColor': 'white', 'borderRadius': '10px', 'marginBottom': '15px',
-              'boxShadow': '0 4px 8px rgba(0,0,0,0.1)', 'flex': '1'})
+    ], style=filter_card_style)
+
+def extract_death_codes(selected_options):
+    """
+    Extrae los códigos de muerte de las opciones seleccionadas en un filtro.
+
+    Args:
+        selected_options (list): Lista de opciones seleccionadas (formato: "X994 - Descripción" o solo el código).
+                                 Puede ser None.
+
+    Returns:
+        list: Lista con los códigos de muerte.
+    """
+    return [option.split(' - ')[0] for option in selected_options or ()]
 
 # Estilo global para todos los dropdowns
 dropdown_style = {
@@ -53,6 +67,12 @@ MONTH_NAMES = {
     7: 'Julio', 8: 'Agosto', 9: 'Septiembre', 10: 'Octubre', 11: 'Noviembre', 12: 'Diciembre'
 }
 
+MONTH_NUMS = {v: k for k, v in MONTH_NAMES.items()}
+
+GENDER_NAMES = {1: 'Masculino', 2: 'Femenino', 3: 'Indeterminado'}
+
+GENDER_CODES = {v: k for k, v in GENDER_NAMES.items()}
+
 # Estilos comunes para tarjetas
 card_style = {
     'boxShadow': '0 4px 8px rgba(0,0,0,0.1)', 
@@ -87,3 +107,20 @@ filter_area_style = {
     'backgroundColor': '#f8f9fa', 
     'borderRadius': '0 0 10px 10px'
 }
+
+# Estilos para las tarjetas de filtro (create_filter_card)
+filter_card_title_style = {
+    'marginBottom': '10px',
+    'fontWeight': 'bold',
+    'color': '#2c3e50',
+    'textAlign': 'center'
+}
+
+filter_card_style = {
+    'padding': '15px',
+    'backgroundColor': 'white',
+    'borderRadius': '10px',
+    'marginBottom': '15px',
+    'boxShadow': '0 4px 8px rgba(0,0,0,0.1)',
+    'flex': '1'
+}
@@ -1,92 +1,132 @@
 """
 Módulo para la creación de visualizaciones y gráficos.
 Contiene funciones para crear diferentes tipos de gráficos utilizados en la aplicación.
+Las trazas se construyen directamente con graph_objects a partir de arreglos de NumPy (sin la inferencia
+de columnas de plotly.express), y las figuras se retornan como dict de plotly: se validan una sola vez al
+construirlas y Dash las serializa sin volver a recorrer los validadores de plotly.
 """
 
-import json
+import functools
 import os
 
+import numpy as np
 import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from src.utils.utils import GENDER_NAMES
+
+# Ruta al archivo GeoJSON con los polígonos simplificados de los departamentos
+# (generado a partir de departamentos.json con scripts/simplify_geojson.py)
+GEOJSON_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'geo', 'departamentos_simplificado.json')
+
+# URL desde la que el servidor entrega el GeoJSON (el navegador lo descarga una vez y lo guarda en caché)
+GEOJSON_URL = '/geo/departamentos.json'
+
+# Mapeo de los nombres de departamentos de Divipola (en mayúsculas) a los nombres del GeoJSON
+DEPARTMENT_MAPPING = {
+    'AMAZONAS': 'AMAZONAS',
+    'ANTIOQUIA': 'ANTIOQUIA',
+    'ARAUCA': 'ARAUCA',
+    'ARCHIPIÉLAGO DE SAN ANDRÉS, PROVIDENCIA Y SANTA CATALINA': 'SAN ANDRES',
+    'ATLÁNTICO': 'ATLANTICO',
+    'BARRANQUILLA D.E.': 'ATLANTICO',
+    'BOGOTÁ, D.C.': 'BOGOTA D.C.',
+    'BOGOTA D.C.': 'BOGOTA D.C.',
+    'BOLÍVAR': 'BOLIVAR',
+    'CARTAGENA D.T. Y C.': 'BOLIVAR',
+    'BOYACÁ': 'BOYACA',
+    'CALDAS': 'CALDAS',
+    'CAQUETÁ': 'CAQUETA',
+    'CASANARE': 'CASANARE',
+    'CAUCA': 'CAUCA',
+    'CESAR': 'CESAR',
+    'CHOCÓ': 'CHOCO',
+    'CÓRDOBA': 'CORDOBA',
+    'CUNDINAMARCA': 'CUNDINAMARCA',
+    'GUAINÍA': 'GUAINIA',
+    'GUAVIARE': 'GUAVIARE',
+    'HUILA': 'HUILA',
+    'LA GUAJIRA': 'LA GUAJIRA',
+    'MAGDALENA': 'MAGDALENA',
+    'SANTA MARTA D.T. Y C.': 'MAGDALENA',
+    'META': 'META',
+    'NARIÑO': 'NARIÑO',
+    'NORTE DE SANTANDER': 'NORTE DE SANTANDER',
+    'PUTUMAYO': 'PUTUMAYO',
+    'QUINDÍO': 'QUINDIO',
+    'RISARALDA': 'RISARALDA',
+    'SANTANDER': 'SANTANDER',
+    'SUCRE': 'SUCRE',
+    'TOLIMA': 'TOLIMA',
+    'VALLE DEL CAUCA': 'VALLE DEL CAUCA',
+    'BUENAVENTURA D.E.': 'VALLE DEL CAUCA',
+    'VAUPÉS': 'VAUPES',
+    'VICHADA': 'VICHADA'
+}
+
+# Plantilla con el estilo común de los gráficos (título centrado, fuentes de los ejes, cuadrícula, fondo y
+# márgenes), combinada una sola vez con la plantilla por defecto de plotly. Cada gráfico solo define sus
+# ajustes particulares, en lugar de repetir el mismo estilo en varias llamadas a update_*.
+# Se registra por nombre porque plotly valida y copia de nuevo los objetos Template en cada figura
+CHART_TEMPLATE = 'mortalidad'
+pio.templates[CHART_TEMPLATE] = pio.templates.merge_templates(pio.templates[pio.templates.default], go.layout.Template(
+    layout=dict(
+        title=dict(x=0.5, xanchor='center', font=dict(size=18)),
+        xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12), gridcolor='#EEEEEE'),
+        yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12), gridcolor='#EEEEEE'),
+        plot_bgcolor='white',
+        margin=dict(l=40, r=40, t=50, b=40)
+    )
+))
 
 
-def create_department_map(deaths_by_dept_map):
+def map_department_names(departments):
     """
-    Crea un mapa coroplético de Colombia mostrando la mortalidad por departamento.
-    
+    Convierte los nombres de departamentos de Divipola a los nombres usados en el GeoJSON.
+
     Args:
-        deaths_by_dept_map (pandas.DataFrame): DataFrame con nombres de departamentos y conteo de muertes.
-        
+        departments (pandas.Series): Serie con nombres de departamentos.
+
     Returns:
-        plotly.graph_objects.Figure: Figura del mapa coroplético.
+        pandas.Series: Serie con los nombres de departamentos del GeoJSON.
     """
-    # Crear una copia para no modificar el original
-    deaths_by_dept_map = deaths_by_dept_map.copy()
-    
-    # Primero estandarizar nombres para facilitar el mapeo
-    deaths_by_dept_map['DEPARTAMENTO'] = deaths_by_dept_map['DEPARTAMENTO'].str.upper()
-
-    # Crear un mapeo comprensivo para hacer coincidir con el GeoJSON
-    department_mapping = {
-        'AMAZONAS': 'AMAZONAS',
-        'ANTIOQUIA': 'ANTIOQUIA',
-        'ARAUCA': 'ARAUCA',
-        'ARCHIPIÉLAGO DE SAN ANDRÉS, PROVIDENCIA Y SANTA CATALINA': 'SAN ANDRES',
-        'ATLÁNTICO': 'ATLANTICO',
-        'BARRANQUILLA D.E.': 'ATLANTICO',
-        'BOGOTÁ, D.C.': 'BOGOTA D.C.',
-        'BOGOTA D.C.': 'BOGOTA D.C.',
-        'BOLÍVAR': 'BOLIVAR',
-        'CARTAGENA D.T. Y C.': 'BOLIVAR',
-        'BOYACÁ': 'BOYACA',
-        'CALDAS': 'CALDAS',
-        'CAQUETÁ': 'CAQUETA',
-        'CASANARE': 'CASANARE',
-        'CAUCA': 'CAUCA',
-        'CESAR': 'CESAR',
-        'CHOCÓ': 'CHOCO',
-        'CÓRDOBA': 'CORDOBA',
-        'CUNDINAMARCA': 'CUNDINAMARCA',
-        'GUAINÍA': 'GUAINIA',
-        'GUAVIARE': 'GUAVIARE',
-        'HUILA': 'HUILA',
-        'LA GUAJIRA': 'LA GUAJIRA',
-        'MAGDALENA': 'MAGDALENA',
-        'SANTA MARTA D.T. Y C.': 'MAGDALENA',
-        'META': 'META',
-        'NARIÑO': 'NARIÑO',
-        'NORTE DE SANTANDER': 'NORTE DE SANTANDER',
-        'PUTUMAYO': 'PUTUMAYO',
-        'QUINDÍO': 'QUINDIO',
-        'RISARALDA': 'RISARALDA',
-        'SANTANDER': 'SANTANDER',
-        'SUCRE': 'SUCRE',
-        'TOLIMA': 'TOLIMA',
-        'VALLE DEL CAUCA': 'VALLE DEL CAUCA',
-        'BUENAVENTURA D.E.': 'VALLE DEL CAUCA',
-        'VAUPÉS': 'VAUPES',
-        'VICHADA': 'VICHADA'
-    }
+    # Aplicar el mapeo a los nombres tal como vienen (los nombres de Divipola ya están en mayúsculas),
+    # con una búsqueda directa en el diccionario
+    departments = departments.astype(object)
+    mapped = departments.map(DEPARTMENT_MAPPING)
+
+    # Solo los nombres sin entrada en el mapeo se estandarizan a mayúsculas y se buscan de nuevo
+    # (los que tampoco tienen entrada se conservan en mayúsculas)
+    missing = mapped.isna() & departments.notna()
+    if missing.any():
+        upper = departments[missing].str.upper()
+        mapped[missing] = upper.map(DEPARTMENT_MAPPING).fillna(upper)
 
-    # Aplicar el mapeo para estandarizar nombres de departamentos
-    deaths_by_dept_map['DEPARTAMENTO'] = deaths_by_dept_map['DEPARTAMENTO'].replace(department_mapping)
+    return mapped
 
-    # Cargar archivo GeoJSON
-    geo_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'geo/departamentos.json')
-    with open(geo_path, 'r', encoding='utf-8') as f:
-        geojson_data = json.load(f)
 
-    # Crear el mapa coroplético
-    fig = px.choropleth(
-        deaths_by_dept_map,
-        geojson=geojson_data,
-        locations='DEPARTAMENTO',
+def _department_map_figure(locations, total_deaths):
+    """
+    Construye la figura del mapa coroplético a partir de los departamentos y sus conteos de muertes.
+
+    Args:
+        locations (numpy.ndarray): Nombres de los departamentos en el GeoJSON.
+        total_deaths (numpy.ndarray): Número de muertes de cada departamento.
+
+    Returns:
+        dict: Figura del mapa coroplético (dict de plotly con las claves 'data' y 'layout').
+    """
+    # Crear el mapa coroplético. El GeoJSON se referencia por su URL en lugar de incluirse en la figura,
+    # de modo que los polígonos no forman parte del JSON de la figura enviado al navegador
+    fig = go.Figure(go.Choropleth(
+        geojson=GEOJSON_URL,
+        locations=locations,
         featureidkey='properties.NOMBRE_DPT',
-        color='TOTAL_DEATHS',
-        color_continuous_scale="Reds",
-        range_color=(0, deaths_by_dept_map['TOTAL_DEATHS'].max()),
-        labels={'TOTAL_DEATHS': 'Número de Muertes'},
-        title='Muertes Totales por Departamento en Colombia (2019)'
-    )
+        z=total_deaths,
+        coloraxis='coloraxis',
+        hovertemplate='DEPARTAMENTO=%{location}<br>Número de Muertes=%{z}<extra></extra>'
+    ))
 
     # Ajustar la vista del mapa para enfocarse en Colombia
     fig.update_geos(
@@ -103,15 +143,20 @@ def create_department_map(deaths_by_dept_map):
     fig.update_layout(
         margin={"r": 0, "t": 30, "l": 0, "b": 0},
         height=700,  # Aumentar la altura para que el mapa sea más grande verticalmente
-        coloraxis_colorbar=dict(
-            title="Número de Muertes",
-            thicknessmode="pixels",
-            thickness=15,
-            lenmode="pixels",
-            len=300,
-            yanchor="top",
-            y=1,
-            ticks="outside"
+        coloraxis=dict(
+            colorscale=px.colors.sequential.Reds,
+            cmin=0,
+            cmax=total_deaths.max(initial=0),
+            colorbar=dict(
+                title="Número de Muertes",
+                thicknessmode="pixels",
+                thickness=15,
+                lenmode="pixels",
+                len=300,
+                yanchor="top",
+                y=1,
+                ticks="outside"
+            )
         ),
         title={
             'text': 'Muertes Totales por Departamento en Colombia (2019)',
@@ -120,7 +165,43 @@ def create_department_map(deaths_by_dept_map):
         }
     )
 
-    return fig
+    return fig.to_dict()
+
+
+@functools.lru_cache(maxsize=1)
+def _empty_department_map():
+    """
+    Construye una sola vez la figura del mapa sin datos (ningún departamento coloreado), usada cuando
+    ningún departamento tiene muertes.
+
+    Returns:
+        dict: Figura del mapa coroplético sin datos.
+    """
+    return _department_map_figure(np.array([], dtype=object), np.array([], dtype=np.int64))
+
+
+def create_department_map(deaths_by_dept_map):
+    """
+    Crea un mapa coroplético de Colombia mostrando la mortalidad por departamento.
+    
+    Args:
+        deaths_by_dept_map (pandas.DataFrame): DataFrame con nombres de departamentos y conteo de muertes.
+        
+    Returns:
+        dict: Figura del mapa coroplético (dict de plotly con las claves 'data' y 'layout').
+    """
+    total_deaths = deaths_by_dept_map['TOTAL_DEATHS'].to_numpy()
+
+    # Sin muertes (datos vacíos o todos los conteos en cero) se retorna el mapa sin datos ya construido,
+    # igual que en la actualización del mapa en el navegador, que omite los departamentos sin muertes
+    if not (total_deaths > 0).any():
+        return _empty_department_map()
+
+    # Estandarizar nombres de departamentos para que coincidan con el GeoJSON
+    # (como una serie independiente, sin copiar ni modificar el DataFrame de entrada)
+    locations = map_department_names(deaths_by_dept_map['DEPARTAMENTO']).to_numpy()
+
+    return _department_map_figure(locations, total_deaths)
 
 
 def create_monthly_deaths_chart(deaths_by_month):
@@ -131,56 +212,28 @@ def create_monthly_deaths_chart(deaths_by_month):
         deaths_by_month (pandas.DataFrame): DataFrame con datos de muertes por mes.
         
     Returns:
-        plotly.graph_objects.Figure: Figura del gráfico de línea.
+        dict: Figura del gráfico de línea (dict de plotly con las claves 'data' y 'layout').
     """
-    fig = px.line(
-        deaths_by_month,
-        x='MONTH_NAME',
-        y='TOTAL_DEATHS',
-        markers=True,
-        labels={
-            'MONTH_NAME': 'Mes',
-            'TOTAL_DEATHS': 'Número de Muertes'
-        },
-        title='Muertes por Mes en Colombia (2019)'
-    )
-
-    # Personalizar el diseño
-    fig.update_traces(
+    # Trazas Scattergl: se dibujan en un canvas WebGL en vez de nodos SVG
+    fig = go.Figure(go.Scattergl(
+        x=deaths_by_month['MONTH_NAME'].to_numpy(),
+        y=deaths_by_month['TOTAL_DEATHS'].to_numpy(),
+        mode='lines+markers',
         line=dict(width=3, color='#6A5ACD'),
-        marker=dict(size=10, color='#6A5ACD')
-    )
+        marker=dict(size=10, color='#6A5ACD'),
+        hovertemplate='Mes=%{x}<br>Número de Muertes=%{y}<extra></extra>'
+    ))
 
-    # Actualizar ejes
-    fig.update_xaxes(
-        title_text='Mes',
-        tickangle=45,
-        title_font=dict(size=14),
-        tickfont=dict(size=12),
-        gridcolor='#EEEEEE'
-    )
-
-    fig.update_yaxes(
-        title_text='Número de Muertes',
-        title_font=dict(size=14),
-        tickfont=dict(size=12),
-        gridcolor='#EEEEEE'
-    )
-
-    # Actualizar diseño general
     fig.update_layout(
-        title={
-            'text': 'Muertes por Mes en Colombia (2019)',
-            'x': 0.5,  # Centrar el título
-            'xanchor': 'center',
-            'font': dict(size=18)
-        },
-        plot_bgcolor='white',
-        hovermode='x unified',
-        margin=dict(l=40, r=40, t=50, b=40)
+        template=CHART_TEMPLATE,
+        title_text='Muertes por Mes en Colombia (2019)',
+        xaxis_title_text='Mes',
+        xaxis_tickangle=45,
+        yaxis_title_text='Número de Muertes',
+        hovermode='x unified'
     )
 
-    return fig
+    return fig.to_dict()
 
 
 def create_violent_cities_chart(top_violent_cities):
@@ -191,57 +244,28 @@ def create_violent_cities_chart(top_violent_cities):
         top_violent_cities (pandas.DataFrame): DataFrame con datos de las ciudades más violentas.
         
     Returns:
-        plotly.graph_objects.Figure: Figura del gráfico de barras.
+        dict: Figura del gráfico de barras (dict de plotly con las claves 'data' y 'layout').
     """
-    fig = px.bar(
-        top_violent_cities,
-        y='MUNICIPIO',
-        x='HOMICIDES',
+    homicides = top_violent_cities['HOMICIDES'].to_numpy()
+    fig = go.Figure(go.Bar(
+        x=homicides,
+        y=top_violent_cities['MUNICIPIO'].to_numpy(),
         orientation='h',
-        labels={
-            'MUNICIPIO': 'Ciudad',
-            'HOMICIDES': 'Número de Homicidios'
-        },
-        title='Ciudades con Mayor Número de Homicidios por Arma de Fuego (2019)',
-        color='HOMICIDES',
-        color_continuous_scale='Reds'
-    )
-
-    # Personalizar el diseño
-    fig.update_traces(
-        marker_line_width=0,
+        marker=dict(color=homicides, coloraxis='coloraxis', line_width=0),
         hovertemplate='<b>%{y}</b><br>Homicidios: %{x}<extra></extra>'
-    )
-
-    # Actualizar ejes
-    fig.update_xaxes(
-        title_text='Número de Homicidios',
-        title_font=dict(size=14),
-        tickfont=dict(size=12),
-        gridcolor='#EEEEEE'
-    )
+    ))
 
-    fig.update_yaxes(
-        title_text='Ciudad',
-        title_font=dict(size=14),
-        tickfont=dict(size=12),
-        autorange="reversed"  # Para mostrar la ciudad con más homicidios en la parte superior
-    )
-
-    # Actualizar diseño general
     fig.update_layout(
-        title={
-            'text': 'Ciudades con Mayor Número de Homicidios por Arma de Fuego (2019)',
-            'x': 0.5,  # Centrar el título
-            'xanchor': 'center',
-            'font': dict(size=18)
-        },
-        plot_bgcolor='white',
-        coloraxis_showscale=False,
-        margin=dict(l=40, r=40, t=50, b=40)
+        template=CHART_TEMPLATE,
+        title_text='Ciudades con Mayor Número de Homicidios por Arma de Fuego (2019)',
+        xaxis_title_text='Número de Homicidios',
+        yaxis_title_text='Ciudad',
+        yaxis_gridcolor='white',  # Sin líneas de cuadrícula entre las ciudades
+        yaxis_autorange='reversed',  # Para mostrar la ciudad con más homicidios en la parte superior
+        coloraxis=dict(colorscale=px.colors.sequential.Reds, showscale=False)
     )
 
-    return fig
+    return fig.to_dict()
 
 
 def create_lowest_mortality_chart(lowest_mortality_cities):
@@ -252,43 +276,31 @@ def create_lowest_mortality_chart(lowest_mortality_cities):
         lowest_mortality_cities (pandas.DataFrame): DataFrame con datos de las ciudades con menor mortalidad.
         
     Returns:
-        plotly.graph_objects.Figure: Figura del gráfico circular.
+        dict: Figura del gráfico circular (dict de plotly con las claves 'data' y 'layout').
     """
-    fig = px.pie(
-        lowest_mortality_cities,
-        values='DEATHS',
-        names='MUNICIPIO',
-        title='Ciudades con Menor Mortalidad (2019)',
+    fig = go.Figure(go.Pie(
+        labels=lowest_mortality_cities['MUNICIPIO'].to_numpy(),
+        values=lowest_mortality_cities['DEATHS'].to_numpy(),
         hole=0.4,
-        color_discrete_sequence=px.colors.sequential.Plasma_r
-    )
-
-    # Personalizar el diseño
-    fig.update_traces(
         textposition='inside',
         textinfo='percent+label',
         hovertemplate='<b>%{label}</b><br>Muertes: %{value}<br>Porcentaje: %{percent}<extra></extra>'
-    )
+    ))
 
-    # Actualizar diseño general
     fig.update_layout(
-        title={
-            'text': 'Ciudades con Menor Mortalidad (2019)',
-            'x': 0.5,  # Centrar el título
-            'xanchor': 'center',
-            'font': dict(size=18)
-        },
+        template=CHART_TEMPLATE,
+        title_text='Ciudades con Menor Mortalidad (2019)',
+        piecolorway=px.colors.sequential.Plasma_r,
         legend=dict(
             orientation="h",
             yanchor="bottom",
             y=-0.2,
             xanchor="center",
             x=0.5
-        ),
-        margin=dict(l=40, r=40, t=50, b=40)
+        )
     )
 
-    return fig
+    return fig.to_dict()
 
 
 def create_age_histogram(deaths_by_age):
@@ -299,57 +311,27 @@ def create_age_histogram(deaths_by_age):
         deaths_by_age (pandas.DataFrame): DataFrame con datos de muertes por grupo de edad.
         
     Returns:
-        plotly.graph_objects.Figure: Figura del histograma.
+        dict: Figura del histograma (dict de plotly con las claves 'data' y 'layout').
     """
-    fig = px.bar(
-        deaths_by_age,
-        x='AGE_GROUP',
-        y='COUNT',
-        labels={
-            'AGE_GROUP': 'Grupo de Edad',
-            'COUNT': 'Número de Muertes'
-        },
-        title='Distribución de Muertes por Grupo de Edad (2019)',
-        color='COUNT',
-        color_continuous_scale='Viridis'
-    )
-
-    # Personalizar el diseño
-    fig.update_traces(
-        marker_line_width=0,
+    counts = deaths_by_age['COUNT'].to_numpy()
+    fig = go.Figure(go.Bar(
+        x=deaths_by_age['AGE_GROUP'].to_numpy(),
+        y=counts,
+        marker=dict(color=counts, coloraxis='coloraxis', line_width=0),
         hovertemplate='<b>%{x}</b><br>Muertes: %{y}<extra></extra>'
-    )
-
-    # Actualizar ejes
-    fig.update_xaxes(
-        title_text='Grupo de Edad',
-        title_font=dict(size=14),
-        tickfont=dict(size=10),
-        tickangle=45,
-        gridcolor='#EEEEEE'
-    )
+    ))
 
-    fig.update_yaxes(
-        title_text='Número de Muertes',
-        title_font=dict(size=14),
-        tickfont=dict(size=12),
-        gridcolor='#EEEEEE'
-    )
-
-    # Actualizar diseño general
     fig.update_layout(
-        title={
-            'text': 'Distribución de Muertes por Grupo de Edad (2019)',
-            'x': 0.5,  # Centrar el título
-            'xanchor': 'center',
-            'font': dict(size=18)
-        },
-        plot_bgcolor='white',
-        coloraxis_showscale=False,
-        margin=dict(l=40, r=40, t=50, b=40)
+        template=CHART_TEMPLATE,
+        title_text='Distribución de Muertes por Grupo de Edad (2019)',
+        xaxis_title_text='Grupo de Edad',
+        xaxis_tickfont_size=10,
+        xaxis_tickangle=45,
+        yaxis_title_text='Número de Muertes',
+        coloraxis=dict(colorscale=px.colors.sequential.Viridis, showscale=False)
     )
 
-    return fig
+    return fig.to_dict()
 
 
 def create_gender_department_chart(deaths_by_dept_gender):
@@ -357,70 +339,44 @@ def create_gender_department_chart(deaths_by_dept_gender):
     Crea un gráfico de barras agrupadas para muertes por género y departamento.
     
     Args:
-        deaths_by_dept_gender (pandas.DataFrame): DataFrame con datos de muertes por género y departamento.
+        deaths_by_dept_gender (pandas.DataFrame): DataFrame con datos de muertes por género y departamento,
+            ya limitado a los 10 departamentos con más muertes (ver select_top_departments).
         
     Returns:
-        plotly.graph_objects.Figure: Figura del gráfico de barras agrupadas.
+        dict: Figura del gráfico de barras agrupadas (dict de plotly con las claves 'data' y 'layout').
     """
-    # Obtener los 10 departamentos con más muertes
-    top_depts = deaths_by_dept_gender.groupby('DEPARTAMENTO')['COUNT'].sum().nlargest(10).index.tolist()
-    
-    # Filtrar el DataFrame para incluir solo esos departamentos
-    filtered_df = deaths_by_dept_gender[deaths_by_dept_gender['DEPARTAMENTO'].isin(top_depts)]
-    
-    # Crear el gráfico de barras agrupadas
-    fig = px.bar(
-        filtered_df,
-        x='DEPARTAMENTO',
-        y='COUNT',
-        color='GENDER',
-        barmode='group',
-        labels={
-            'DEPARTAMENTO': 'Departamento',
-            'COUNT': 'Número de Muertes',
-            'GENDER': 'Género'
-        },
-        title='Muertes por Género en los 10 Departamentos Principales (2019)',
-        color_discrete_map={
-            'Masculino': '#3366CC',
-            'Femenino': '#FF6699',
-            'Indeterminado': '#66CCCC'
-        }
-    )
-    
-    # Personalizar el diseño
-    fig.update_traces(
-        marker_line_width=0,
-        hovertemplate='<b>%{x}</b><br>Género: %{color}<br>Muertes: %{y}<extra></extra>'
-    )
-    
-    # Actualizar ejes
-    fig.update_xaxes(
-        title_text='Departamento',
-        title_font=dict(size=14),
-        tickfont=dict(size=10),
-        tickangle=45,
-        gridcolor='#EEEEEE'
-    )
-    
-    fig.update_yaxes(
-        title_text='Número de Muertes',
-        title_font=dict(size=14),
-        tickfont=dict(size=12),
-        gridcolor='#EEEEEE'
-    )
+    # Colores de cada género
+    colors = {
+        'Masculino': '#3366CC',
+        'Femenino': '#FF6699',
+        'Indeterminado': '#66CCCC'
+    }
+
+    # Crear una traza de barras por género. Las trazas siguen el orden de GENDER_NAMES, para que los
+    # callbacks puedan actualizarlas por posición
+    genders = deaths_by_dept_gender['GENDER'].to_numpy()
+    departments = deaths_by_dept_gender['DEPARTAMENTO'].to_numpy()
+    counts = deaths_by_dept_gender['COUNT'].to_numpy()
+    fig = go.Figure([
+        go.Bar(
+            x=departments[genders == gender],
+            y=counts[genders == gender],
+            name=gender,
+            marker=dict(color=colors[gender], line_width=0),
+            hovertemplate='<b>%{x}</b><br>Género: %{color}<br>Muertes: %{y}<extra></extra>'
+        )
+        for gender in GENDER_NAMES.values()
+    ])
     
-    # Actualizar diseño general
     fig.update_layout(
-        title={
-            'text': 'Muertes por Género en los 10 Departamentos Principales (2019)',
-            'x': 0.5,  # Centrar el título
-            'xanchor': 'center',
-            'font': dict(size=18)
-        },
-        plot_bgcolor='white',
-        legend_title_text='Género',
-        margin=dict(l=40, r=40, t=50, b=40)
+        template=CHART_TEMPLATE,
+        title_text='Muertes por Género en los 10 Departamentos Principales (2019)',
+        barmode='group',
+        xaxis_title_text='Departamento',
+        xaxis_tickfont_size=10,
+        xaxis_tickangle=45,
+        yaxis_title_text='Número de Muertes',
+        legend_title_text='Género'
     )
     
-    return fig
\ No newline at end of file
+    return fig.to_dict()
\ No newline at end of file